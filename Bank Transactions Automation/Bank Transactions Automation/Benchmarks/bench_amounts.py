@@ -0,0 +1,61 @@
+import argparse
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+# Parse time of read_statement (thousands separator handled by the CSV parser)
+# against the old read_csv + three str.replace/astype(float) passes.
+# Run from anywhere:  python bench_amounts.py --rows 100000 1000000
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "Main"))
+
+from amounts import read_statement  # noqa: E402
+
+SAMPLE = os.path.join(HERE, "..", "Files", "100 BT Records.csv")
+
+
+def legacy_parse(source):
+    df = pd.read_csv(source)
+    df.columns = [col.strip() for col in df.columns]
+    df["Deposits"] = df["Deposits"].str.replace(",", "").astype(float)
+    df["Withdrawls"] = df["Withdrawls"].str.replace(",", "").astype(float)
+    df["Balance"] = df["Balance"].str.replace(",", "").astype(float)
+    return df
+
+
+def make_csv(rows):
+    with open(SAMPLE, "rb") as f:
+        header, *lines = f.read().splitlines()
+    body = (lines * (rows // len(lines) + 1))[:rows]
+    return b"\n".join([header] + body) + b"\n"
+
+
+def best_of(func, data, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(io.BytesIO(data))
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark amount parsing")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>12}{'legacy s':>12}{'parser s':>12}{'speedup':>10}")
+    for rows in args.rows:
+        data = make_csv(rows)
+        old = best_of(legacy_parse, data, args.repeat)
+        new = best_of(read_statement, data, args.repeat)
+        print(f"{rows:>12,}{old:>12.4f}{new:>12.4f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+# Rows/sec of the compiled CategoryMatcher against the old iterrows() loops.
+# Run from anywhere:  python bench_categorize.py --rows 5000 50000
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "Main"))
+
+from categorizer import CategoryMatcher  # noqa: E402
+
+FILES = os.path.join(HERE, "..", "Files")
+CATEGORY_FILE = os.path.join(HERE, "..", "Main", "categories.json")
+
+PROJ_MAPPING = {
+    "Income": ["NEFT", "RTGS", "ATM", "Interest", "Reversal"],
+    "Expenses": ["Purchase", "Bill", "Tax", "Debit Card", "Commission"],
+    "Transfers": ["IMPS", "Transfer", "Cheque"],
+    "Miscellaneous": ["Miscellaneous", "Cash"],
+    "Service Fees & Deductions": ["Charges", "Commission", "Reversal", "Debit Card", "Tax"]
+}
+
+
+# The loops Main.py and Main_proj.py used before the matcher
+def legacy_exact(df, categories):
+    df["Category"] = "Uncategorized"
+    for category, keywords in categories.items():
+        if category == "Uncategorized" or not keywords:
+            continue
+        lower_keywords = [keyword.lower() for keyword in keywords]
+        for idx, row in df.iterrows():
+            details = row["Description"].lower()
+            if details in lower_keywords:
+                df.at[idx, "Category"] = category
+    return df
+
+
+def legacy_substring(df, category_mapping):
+    df["Category"] = "Uncategorized"
+    for category, keywords in category_mapping.items():
+        for idx, row in df.iterrows():
+            description = str(row["Description"]).lower()
+            if any(keyword.lower() in description for keyword in keywords):
+                df.at[idx, "Category"] = category
+    return df
+
+
+def make_frame(rows):
+    # Tile the sample statements up to the requested size; mix in the json keywords
+    # so exact matching has something to hit
+    sample = pd.read_csv(os.path.join(FILES, "5000 BT Records.csv"))
+    with open(CATEGORY_FILE) as f:
+        categories = json.load(f)
+    keywords = [k for values in categories.values() for k in values]
+    descriptions = pd.concat([sample["Description"], pd.Series(keywords * 50)], ignore_index=True)
+    repeats = rows // len(descriptions) + 1
+    return pd.DataFrame({"Description": pd.concat([descriptions] * repeats, ignore_index=True)[:rows]})
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transaction categorization")
+    parser.add_argument("--rows", type=int, nargs="+", default=[5000, 50000])
+    parser.add_argument("--skip-legacy-above", type=int, default=100000,
+                        help="don't run the iterrows loops on frames larger than this")
+    args = parser.parse_args()
+
+    with open(CATEGORY_FILE) as f:
+        categories = json.load(f)
+
+    print(f"{'mode':<10}{'rows':>12}{'legacy rows/s':>16}{'matcher rows/s':>16}{'speedup':>10}")
+    for rows in args.rows:
+        df = make_frame(rows)
+        cases = [
+            ("exact", legacy_exact, categories,
+             lambda d: CategoryMatcher(categories, mode="exact").categorize_frame(d)),
+            ("substring", legacy_substring, PROJ_MAPPING,
+             lambda d: CategoryMatcher(PROJ_MAPPING, mode="substring").categorize_frame(d)),
+        ]
+        for mode, legacy, mapping, compiled in cases:
+            new_time = timed(compiled, df.copy())
+            if rows <= args.skip_legacy_above:
+                old_time = timed(legacy, df.copy(), mapping)
+                old_rate = f"{rows / old_time:,.0f}"
+                speedup = f"{old_time / new_time:,.0f}x"
+            else:
+                old_rate, speedup = "skipped", "-"
+            print(f"{mode:<10}{rows:>12,}{old_rate:>16}{rows / new_time:>16,.0f}{speedup:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Synthetic bank statements for benchmarking, from 10^3 up to 10^8 rows.
+#
+#   python generate_statements.py --rows 1000000 --out statements/1M.csv
+#
+# Descriptions are drawn from the sample files plus the categories.json keywords (some
+# with a terminal-ID suffix, like real exports). Deposits and withdrawals are resampled
+# from the sample files, dates advance a few days at a time, and Balance is the running
+# total so the output reconciles. Rows are generated and written in chunks, so memory
+# stays flat whatever the size.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FILES = os.path.join(HERE, "..", "Files")
+CATEGORY_FILE = os.path.join(HERE, "..", "Main", "categories.json")
+HEADER = "Date,Description,Deposits,Withdrawls,Balance\n"
+
+
+def load_samples():
+    frames = []
+    for name in sorted(os.listdir(FILES)):
+        if name.endswith("BT Records.csv"):
+            df = pd.read_csv(os.path.join(FILES, name), thousands=",")
+            df.columns = [col.strip().replace("Withdrawals", "Withdrawls") for col in df.columns]
+            frames.append(df)
+    sample = pd.concat(frames, ignore_index=True)
+    with open(CATEGORY_FILE) as f:
+        keywords = [k for values in json.load(f).values() for k in values]
+    return sample, keywords
+
+
+def format_amounts(values, grouped):
+    if grouped:
+        return pd.Series(values).map("{:,.2f}".format).to_numpy()
+    return np.char.mod("%.2f", values)
+
+
+def generate(rows, out, seed=0, rows_per_day=30, chunk=1_000_000, grouped=True, start="2020-01-01"):
+    rng = np.random.default_rng(seed)
+    sample, keywords = load_samples()
+    descriptions = np.concatenate([sample["Description"].astype(str).to_numpy(), np.asarray(keywords * 20)])
+    # Only the nonzero side of each sample row, so every generated row moves money
+    deposits = sample["Deposits"].to_numpy(dtype=float)
+    deposits = deposits[deposits > 0]
+    withdrawals = sample["Withdrawls"].to_numpy(dtype=float)
+    withdrawals = withdrawals[withdrawals > 0]
+
+    balance = 50_000.0
+    day = pd.Timestamp(start)
+    written = 0
+    with open(out, "w", newline="") as f:
+        f.write(HEADER)
+        while written < rows:
+            n = min(chunk, rows - written)
+            desc = descriptions[rng.integers(0, len(descriptions), n)].astype(object)
+            suffixed = rng.random(n) < 0.2
+            desc[suffixed] = desc[suffixed] + " " + rng.integers(1000, 9999, suffixed.sum()).astype(str)
+
+            # Each row is either a deposit or a withdrawal
+            is_deposit = rng.random(n) < 0.5
+            dep = np.where(is_deposit, deposits[rng.integers(0, len(deposits), n)], 0.0)
+            wd = np.where(is_deposit, 0.0, withdrawals[rng.integers(0, len(withdrawals), n)])
+            cents = np.round((dep - wd) * 100).astype(np.int64)
+            bal = (round(balance * 100) + np.cumsum(cents)) / 100
+            balance = bal[-1]
+
+            offsets = np.cumsum(rng.random(n) < 1 / rows_per_day)
+            dates = (day + pd.to_timedelta(offsets, unit="D")).strftime("%d-%b-%Y").to_numpy()
+            day = day + pd.Timedelta(days=int(offsets[-1]))
+
+            frame = pd.DataFrame({
+                "Date": dates,
+                "Description": desc,
+                "Deposits": format_amounts(dep, grouped),
+                "Withdrawls": format_amounts(wd, grouped),
+                "Balance": format_amounts(bal, grouped),
+            })
+            frame.to_csv(f, header=False, index=False)
+            written += n
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic bank statement CSV")
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rows-per-day", type=int, default=30)
+    parser.add_argument("--chunk", type=int, default=1_000_000)
+    parser.add_argument("--plain", action="store_true", help="write amounts without thousands separators (faster)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = generate(args.rows, args.out, seed=args.seed, rows_per_day=args.rows_per_day,
+                    chunk=args.chunk, grouped=not args.plain)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {rows:,} rows to {args.out} in {elapsed:.1f}s ({os.path.getsize(args.out) / 1e6:,.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
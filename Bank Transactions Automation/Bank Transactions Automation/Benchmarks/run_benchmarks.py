@@ -0,0 +1,194 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# End-to-end benchmark of the statement pipeline on synthetic data.
+#
+#   python run_benchmarks.py --sizes 1000 100000 1000000 --out results.json
+#   python run_benchmarks.py --sizes 1000000 --compare results.json
+#
+# Statements are made with generate_statements.py (and reused from --data-dir if
+# already there). Every stage is timed on its own (best of --repeat), then run once
+# more under tracemalloc for its peak allocation. The JSON output records the commit
+# and library versions so runs from different revisions can be compared.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MAIN = os.path.join(HERE, "..", "Main")
+sys.path.insert(0, MAIN)
+
+from amounts import read_statement  # noqa: E402
+from categorizer import CategoryMatcher  # noqa: E402
+from chart_data import bucket_totals, downsample  # noqa: E402
+from generate_statements import generate  # noqa: E402
+from reconcile import reconcile  # noqa: E402
+from rollup import RollupCube  # noqa: E402
+
+try:
+    import plotly.express as px
+except ImportError:
+    px = None
+
+with open(os.path.join(MAIN, "categories.json")) as f:
+    CATEGORIES = json.load(f)
+
+
+def stage_parse(ctx):
+    ctx["df"] = read_statement(ctx["path"])
+
+
+def stage_categorize_exact(ctx):
+    CategoryMatcher(CATEGORIES, mode="exact").categorize_frame(ctx["df"].copy())
+
+
+def stage_categorize_substring(ctx):
+    ctx["df"] = CategoryMatcher(CATEGORIES, mode="substring").categorize_frame(ctx["df"])
+
+
+def stage_groupby(ctx):
+    # What the dashboard did before the rollup cube, kept as a reference point
+    for column in ["Deposits", "Withdrawls", "Balance"]:
+        ctx["df"].groupby("Category")[column].sum().reset_index()
+
+
+def stage_cube(ctx):
+    ctx["cube"] = RollupCube(ctx["df"])
+
+
+def stage_cube_summaries(ctx):
+    cube = ctx["cube"]
+    for column in ["Deposits", "Withdrawls", "Balance"]:
+        cube.category_totals(column)
+    cube.per_day("Balance")
+    cube.by_period("Withdrawls", "M", by_category=True)
+
+
+def stage_chart_data(ctx):
+    ctx["bars"], _ = bucket_totals(ctx["df"], "Withdrawls", by="Category")
+    ctx["line"] = downsample(ctx["df"], "Balance")
+
+
+def stage_figures(ctx):
+    px.bar(ctx["bars"], x="Date", y="Withdrawls", color="Category")
+    px.line(ctx["line"], x="Date", y="Balance")
+
+
+def stage_reconcile(ctx):
+    reconcile(ctx["df"])
+
+
+STAGES = [
+    ("parse", stage_parse),
+    ("categorize_exact", stage_categorize_exact),
+    ("categorize_substring", stage_categorize_substring),
+    ("groupby", stage_groupby),
+    ("cube", stage_cube),
+    ("cube_summaries", stage_cube_summaries),
+    ("chart_data", stage_chart_data),
+    ("figures", stage_figures),
+    ("reconcile", stage_reconcile),
+]
+
+
+def timed(func, ctx, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(ctx)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def peak_memory(func, ctx):
+    tracemalloc.start()
+    try:
+        func(ctx)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def statement_for(rows, data_dir):
+    path = os.path.join(data_dir, f"statement_{rows}.csv")
+    if not os.path.exists(path):
+        generate(rows, path)
+    return path
+
+
+def run(sizes, data_dir, repeat, memory=True):
+    results = []
+    for rows in sizes:
+        ctx = {"path": statement_for(rows, data_dir)}
+        for name, func in STAGES:
+            if name == "figures" and px is None:
+                continue
+            seconds = timed(func, ctx, repeat)
+            peak = peak_memory(func, ctx) if memory else None
+            results.append({
+                "rows": rows,
+                "stage": name,
+                "seconds": round(seconds, 6),
+                "rows_per_sec": round(rows / seconds) if seconds else None,
+                "peak_mb": None if peak is None else round(peak / 2**20, 3),
+            })
+            print(f"{rows:>12,} {name:<22}{seconds:>10.4f}s"
+                  + ("" if peak is None else f"{peak / 2**20:>10.1f} MB"))
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(results, baseline_file):
+    with open(baseline_file) as f:
+        baseline = {(r["rows"], r["stage"]): r for r in json.load(f)["results"]}
+    print(f"\n{'rows':>12} {'stage':<22}{'before s':>10}{'after s':>10}{'speedup':>9}")
+    for r in results:
+        old = baseline.get((r["rows"], r["stage"]))
+        if old and r["seconds"]:
+            print(f"{r['rows']:>12,} {r['stage']:<22}{old['seconds']:>10.4f}{r['seconds']:>10.4f}"
+                  f"{old['seconds'] / r['seconds']:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the statement pipeline stage by stage")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "bank_statements"))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--out", help="write results as JSON")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = run(args.sizes, args.data_dir, args.repeat, memory=not args.no_memory)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"meta": metadata(), "results": results}, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
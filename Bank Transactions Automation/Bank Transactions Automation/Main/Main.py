@@ -2,107 +2,529 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import json
-import os
 import random
+import io
+
+from amounts import read_statement
+from compact import CompactLedger, memory_report
+from chart_data import POINT_BUDGET, BUCKET_NAMES, bucket_totals, to_dates, window
+from edits import apply_category_edits
+from ingest import stream_transactions
+from ledger import Ledger
+from paged_editor import PAGE_SIZES, SORT_COLUMNS, PagedTable
+from profiling import PROFILE_DIR, Profiler
+from reconcile import reconcile
+from rules import RuleRegistry
+from recurring import HORIZON_DAYS, detect_recurring, upcoming
+from rollup import RollupCube
+from suggest import SuggestionModel
+from transaction_cache import CACHE_DIR, TransactionCache, file_key
 
 st.set_page_config(page_title="Bank Transactions Automation", page_icon="💰", layout="wide")
 
-category_file = "Pycharm\Python Project\Beginner Project\Bank Transactions Automation\Main\categories.json"
+@st.cache_resource
+def get_rule_registry():
+    # One per server: categories.json (or BANK_CATEGORIES_FILE) is re-read and its matchers
+    # recompiled only when the file changes, and every session shares them
+    return RuleRegistry()
 
-if "categories" not in st.session_state:
-    st.session_state.categories = {
-        'Uncategorized' : []
-    }
-    
-if os.path.exists(category_file):
-    with open(category_file, 'r') as f:
-        st.session_state.categories = json.load(f)
+rules = get_rule_registry().current()
+st.session_state.categories = rules.categories
+
+# Per-stage timings of each rerun, switched on from the sidebar ("⏱️ Stage timings")
+if "profiler" not in st.session_state:
+    st.session_state.profiler = Profiler()
+profiler = st.session_state.profiler
 
 def save_categories():
+    # Writes everything recorded since the last save in one append
+    get_rule_registry().flush()
 
-    with open(category_file, 'w') as f:
-        json.dump(st.session_state.categories, f)
-        
 def add_keyword(category, keyword):
-    if keyword not in st.session_state.categories[category]:
-        st.session_state.categories[category].append(keyword)
-        save_categories()
-        return True
+    # Recorded only; call save_categories() once the whole batch is in
+    return get_rule_registry().add_keyword(category, keyword)
     
-    return False
-    
-def load_transactions(file):
+@st.cache_resource
+def get_transaction_cache():
+    # Shared by every session on this server; set BANK_CACHE_DIR to also keep entries on disk
+    return TransactionCache(max_entries=8, cache_dir=CACHE_DIR)
+
+def parse_transactions(data):
+    # Amounts are converted to float while the CSV is read (see amounts.py)
+    with profiler.stage("parse") as rec:
+        df = read_statement(io.BytesIO(data))
+        rec.rows = len(df)
+    return df
+
+def load_transactions(file, key):
     try: 
-        df = pd.read_csv(file)
-        df.columns = [col.strip() for col in df.columns]
-        df["Deposits"] = df["Deposits"].str.replace(",","").astype(float)
-        df["Withdrawls"] = df["Withdrawls"].str.replace(",","").astype(float)
-        df["Balance"] = df["Balance"].str.replace(",","").astype(float)
-        return categorize_transaction(df)
+        # Reruns with the same upload and the same categories come straight from the cache;
+        # key is the upload's file_key, hashed once per rerun by the caller
+        with profiler.stage("load") as rec:
+            df = get_transaction_cache().load(
+                file.getvalue(),
+                rules.categories,
+                parse=parse_transactions,
+                categorize=categorize_transaction,
+                matcher=build_matcher(),
+                version=rules.version,
+                key=key,
+            )
+            rec.rows = len(df)
+        return df
     except Exception as e:
         st.error(f"Error Processing the File 😔 : {str(e)}")
 
+def build_matcher():
+    # Exact: one hash lookup per row against every keyword at once (first listed category wins).
+    # Fuzzy: trigram scoring that tolerates terminal IDs and suffixes, cached per description.
+    # Compiled once per version of the rules and shared by all sessions (see rules.py).
+    mode = st.session_state.get("match_mode", "Exact")
+    st.session_state.matcher_key = (mode, rules.version)
+    return rules.matcher(mode.lower())
+
 def categorize_transaction(df):
-    df["Category"] = "Uncategorized"
-    for category, keywords in st.session_state.categories.items():
-        if category == "Uncategorized" or not keywords:
+    with profiler.stage("categorize", rows=len(df)):
+        return build_matcher().categorize_frame(df)
+
+def get_rollup(key, df):
+    # Built once per upload; later reruns only move the rows whose Category changed
+    with profiler.stage("rollup", rows=len(df)):
+        if st.session_state.get("rollup_key") != key:
+            st.session_state.rollup = RollupCube(df)
+            st.session_state.rollup_key = key
+        else:
+            st.session_state.rollup.sync(df["Category"])
+    return st.session_state.rollup
+
+def merge_statements(files):
+    # Overlapping exports are combined into one date-ordered ledger without duplicate transactions.
+    # Files already merged in this session are skipped, so adding one more export only merges that one.
+    keys = [file_key(file.getvalue()) for file in files]
+    ledger = st.session_state.get("ledger")
+    if ledger is None or not set(ledger.sources) <= set(keys):
+        ledger = st.session_state.ledger = Ledger()
+
+    for file, key in zip(files, keys):
+        if key in ledger.sources:
             continue
-        lower_keywords = [keyword.lower() for keyword in keywords]
-        for idx, row in df.iterrows():
-            details = row["Description"].lower()
-            if details in lower_keywords:
-                df.at[idx, "Category"] = category
-    return df
-        
+        df = load_transactions(file, key)
+        if df is None:
+            continue
+        added, dropped = ledger.add(df.drop(columns="Category"), source=key)
+        st.toast(f"{file.name}: {added:,} new transactions, {dropped:,} duplicates skipped")
+
+    if not len(ledger):
+        return None, None
+    # The merged rows go through the same cache as a single upload, keyed by their sources:
+    # reruns get the labelled frame back and a rules change only retags the rows it affects
+    source_key = "+".join(ledger.sources)
+    try:
+        with profiler.stage("load") as rec:
+            df = get_transaction_cache().load(
+                None,
+                rules.categories,
+                parse=lambda _: ledger.frame,
+                categorize=categorize_transaction,
+                matcher=build_matcher(),
+                version=rules.version,
+                key=file_key(source_key.encode()),
+            )
+            rec.rows = len(df)
+    except Exception as e:
+        st.error(f"Error Processing the File 😔 : {str(e)}")
+        return None, None
+    return df, source_key
+
+def get_compact_ledger(key, df):
+    # The session keeps one compact copy of the rows (categoricals + one amount block);
+    # editor and chart frames are derived from it on demand
+    with profiler.stage("compact ledger", rows=len(df)):
+        if st.session_state.get("main_df_key") != key:
+            st.session_state.main_df = CompactLedger(df)
+            st.session_state.main_df_key = key
+        else:
+            st.session_state.main_df.sync_categories(df["Category"])
+    return st.session_state.main_df
+
+def get_paged_table():
+    # Follows the compact ledger; sort orders are built the first time a column is sorted or filtered on
+    table = st.session_state.get("paged_table")
+    if table is None or table.ledger is not st.session_state.main_df:
+        table = st.session_state.paged_table = PagedTable(st.session_state.main_df)
+    return table
+
+def paged_editor(columns, amount_column, key, column_config, extra=None, disabled=None):
+    # Filtering, sorting and paging happen here on the server; only the current page goes to the browser.
+    # Returned rows keep their row IDs as the index, so Apply Changes writes back to the right transactions.
+    table = get_paged_table()
+    dates = pd.Series(st.session_state.main_df.dates).dropna()
+
+    with st.expander("🔎 Filter rows"):
+        col1, col2 = st.columns(2)
+        start = end = None
+        if len(dates):
+            lo, hi = dates.min().date(), dates.max().date()
+            span = col1.date_input("Date range", value=(lo, hi), min_value=lo, max_value=hi, key=f"{key}_dates")
+            start, end = (tuple(span) + (None, None))[:2]
+        categories = col2.multiselect("Category", list(st.session_state.categories.keys()), key=f"{key}_categories")
+        col1, col2, col3 = st.columns(3)
+        low = col1.number_input(f"Min {amount_column}", value=None, key=f"{key}_low")
+        high = col2.number_input(f"Max {amount_column}", value=None, key=f"{key}_high")
+        search = col3.text_input("Description contains", key=f"{key}_search")
+
+    col1, col2, col3, col4 = st.columns(4)
+    sort = col1.selectbox("Sort by", SORT_COLUMNS, key=f"{key}_sort")
+    descending = col2.toggle("Descending", key=f"{key}_descending")
+    size = col3.selectbox("Rows per page", PAGE_SIZES, index=2, key=f"{key}_size")
+    with profiler.stage("filter", rows=len(table)):
+        positions = table.select(sort=sort, descending=descending, start=start, end=end, categories=categories,
+                                 amount_column=amount_column, low=low, high=high, search=search)
+    pages = max(1, -(-len(positions) // size))
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    number = col4.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, key=f"{key}_page")
+
+    # Plain text columns, so the Category selectbox can offer categories the statement doesn't use yet
+    page = table.page(positions, number - 1, size, columns).astype({"Description": object, "Category": object})
+    for name, values in (extra or {}).items():
+        page[name] = values.reindex(page.index)
+    st.caption(f"{len(positions):,} of {len(table):,} rows match - showing {len(page):,}. "
+               "Apply changes before turning the page.")
+
+    # A new editor per page / filter / applied edit, so pending edits never land on other rows
+    view = (start, end, tuple(categories), low, high, search, sort, descending, size, number,
+            st.session_state.get("edit_version", 0))
+    with profiler.stage("editor", rows=len(page)):
+        return st.data_editor(
+            page,
+            column_config=column_config,
+            disabled=disabled or [],
+            hide_index=True,
+            use_container_width=True,
+            key=f"{key}_{hash(view)}"
+        )
+
+def table_page(count, key):
+    # Page picker for a read-only table: only the returned slice of rows goes to the browser
+    col1, col2 = st.columns([3, 1])
+    size = col2.selectbox("Rows per page", PAGE_SIZES, index=2, key=f"{key}_size")
+    pages = max(1, -(-count // size))
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    number = col1.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, key=f"{key}_page")
+    start = (number - 1) * size
+    st.caption(f"Rows {min(start + 1, count):,}-{min(start + size, count):,} of {count:,}")
+    return slice(start, start + size)
+
+def show_memory_report():
+    with st.sidebar.expander("🧠 Session memory"):
+        report = memory_report(st.session_state)
+        st.metric("This session", f"{report['Bytes'].sum() / 1e6:,.2f} MB")
+        st.caption(f"Shared parse cache: {get_transaction_cache().nbytes() / 1e6:,.2f} MB")
+        st.dataframe(report, hide_index=True, use_container_width=True)
+
+def get_suggestions(key, df):
+    # Model is retrained only when the upload or the rules change; Uncategorized rows get a suggestion.
+    # The suggestions are kept with it and redone only after an edit changes which rows are Uncategorized.
+    model_key = (key, st.session_state.get("matcher_key"))
+    prediction_key = model_key + (st.session_state.get("edit_version", 0),)
+    with profiler.stage("suggestions", rows=len(df)):
+        if st.session_state.get("suggest_key") != model_key:
+            st.session_state.suggest_model = SuggestionModel().fit(df["Description"], df["Category"])
+            st.session_state.suggest_key = model_key
+        if st.session_state.get("suggestions_key") != prediction_key:
+            uncategorized = df["Category"] == "Uncategorized"
+            suggested, confidence = st.session_state.suggest_model.predict(df.loc[uncategorized, "Description"])
+            st.session_state.suggestions = (suggested.reindex(df.index), confidence.reindex(df.index))
+            st.session_state.suggestions_key = prediction_key
+    return st.session_state.suggestions
+
+def get_recurring(key, df):
+    # Depends only on dates, descriptions and amounts, so it runs once per upload;
+    # categories are looked up from the ledger when shown
+    if st.session_state.get("recurring_key") != key:
+        with profiler.stage("recurring", rows=len(df)):
+            st.session_state.recurring = detect_recurring(df)
+        st.session_state.recurring_key = key
+    return st.session_state.recurring
+
+def show_recurring(recurring):
+    st.subheader("🔁 Recurring Payments")
+    if not len(recurring):
+        st.info("No recurring transactions found in this statement.")
+        return
+    categories = st.session_state.main_df.column("Category").astype(object)
+    series = recurring.assign(Category=categories.reindex(recurring["Row"]).to_numpy())
+    active = series[series["Active"]]
+    charges = active[active["Amount"] < 0]
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Recurring Series", f"{len(series):,}")
+    col2.metric("Still Active", f"{len(active):,}")
+    col3.metric("Committed Spend / Month", f"{-charges['Annual'].sum() / 12:,.2f} AED")
+    st.dataframe(
+        series.drop(columns=["Row", "Interval"]),
+        column_config={
+            "Amount": st.column_config.NumberColumn("Amount", format="%.2f AED"),
+            "Annual": st.column_config.NumberColumn("Per Year", format="%.2f AED"),
+        },
+        hide_index=True,
+        use_container_width=True)
+
+    st.subheader("")
+    st.subheader("📅 Upcoming Charges")
+    horizon = st.slider("Days ahead", 7, 365, HORIZON_DAYS, key="recurring_horizon")
+    # Projected from the end of the statement, when the series were last seen
+    start = series["Last"].max() + pd.Timedelta(days=1)
+    projected = upcoming(series, start=start, horizon_days=horizon)
+    if not len(projected):
+        st.caption("Nothing due in this window.")
+        return
+    projected["Category"] = categories.reindex(projected["Row"]).to_numpy()
+    projected = projected.drop(columns="Row")
+    st.caption(f"{len(projected):,} transactions expected from {start:%d-%b-%Y}, "
+               f"{-projected.loc[projected['Amount'] < 0, 'Amount'].sum():,.2f} AED going out")
+    with profiler.stage("figure", rows=len(projected)):
+        fig = px.bar(projected, x="Date", y="Amount", color="Description", title="")
+    plot_chart(fig, len(projected))
+    st.dataframe(
+        projected,
+        column_config={"Amount": st.column_config.NumberColumn("Amount", format="%.2f AED")},
+        hide_index=True,
+        use_container_width=True)
+
+def apply_suggestions(suggested, confidence, threshold):
+    # Accepts every suggestion at or above the threshold as one batch of edits
+    accepted = confidence >= threshold
+    edited = st.session_state.main_df.view("Description", "Category").loc[accepted[accepted].index]
+    edited = edited.astype({"Category": object})
+    edited["Category"] = suggested[accepted]
+    apply_changes(edited)
+
+def apply_changes(edited_df):
+    # Writes back only the rows whose Category changed and saves their keywords in one batch
+    with profiler.stage("apply edits", rows=len(edited_df)):
+        result = apply_category_edits(st.session_state.main_df, edited_df, get_rule_registry())
+        st.session_state.rollup.sync(st.session_state.main_df.column("Category"))
+    st.session_state.edit_version = st.session_state.get("edit_version", 0) + 1
+    st.success(f"Applied {result.rows:,} changed rows ({result.keywords:,} new keywords) "
+               f"in {result.seconds * 1000:.1f} ms")
+
+def date_bar_chart(df, column, how, key):
+    # One bar per transaction while they fit the point budget, otherwise totals per day/week/month.
+    # Narrowing the date range brings the per-transaction detail back.
+    # Give it a frame with Date already parsed (see chart_frame) so nothing is parsed per rerun.
+    dates = to_dates(df["Date"])
+    if dates.notna().any() and dates.min() < dates.max():
+        lo, hi = dates.min().date(), dates.max().date()
+        start, end = st.slider("Zoom (date range)", min_value=lo, max_value=hi, value=(lo, hi), key=key)
+        df = window(df, start, end)
+
+    if len(df) <= POINT_BUDGET:
+        data = df
+    else:
+        with profiler.stage("chart data", rows=len(df)):
+            data, bucket = bucket_totals(df, column, how=how)
+        st.caption(f"{len(df):,} transactions shown as totals per {BUCKET_NAMES[bucket].lower()} "
+                   "- narrow the date range for full detail")
+
+    with profiler.stage("figure", rows=len(data)):
+        fig = px.bar(
+            data,
+            x=column,
+            y="Date",
+            orientation="h",
+            title="",
+            text_auto=len(data) <= 200,
+            color=column,  # Color bars based on amount
+            color_continuous_scale="Blues"  # Nice color theme
+        )
+    plot_chart(fig, len(data))
+
+def chart_frame(df):
+    # The statement with the compact ledger's parsed dates in place of the Date strings
+    return df.assign(Date=st.session_state.main_df.column("Date"))
+
+def plot_chart(fig, rows=None):
+    # Serializing the figure and sending it to the browser, timed apart from building it
+    with profiler.stage("render chart", rows=rows):
+        st.plotly_chart(fig, use_container_width=True)
+
+def get_reconciliation(key, df):
+    # Balances, dates and descriptions don't change with categories, so this runs once per upload
+    if st.session_state.get("reconcile_key") != key:
+        with profiler.stage("reconcile", rows=len(df)):
+            st.session_state.reconciliation = reconcile(df)
+        st.session_state.reconcile_key = key
+    return st.session_state.reconciliation
+
+def show_reconciliation(result):
+    # Summary panel for the running-balance check (Balance = previous Balance + Deposits - Withdrawls)
+    with st.expander("🧾 Reconciliation", expanded=any(result[flag] for flag in ("Balance Break", "Duplicate", "Out of Order"))):
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Balance Breaks", f"{result['Balance Break']:,}")
+        col2.metric("Duplicate Rows", f"{result['Duplicate']:,}")
+        col3.metric("Out of Order Dates", f"{result['Out of Order']:,}")
+        col4.metric("Total Drift", f"{result['drift']:,.2f} AED")
+
+def stream_statement(file, key, keep_rows):
+    # Streamed once per upload, rules version and match mode; widget reruns reuse the summary
+    matcher = build_matcher()
+    stream_key = (key, st.session_state.matcher_key, keep_rows)
+    if st.session_state.get("stream_key") != stream_key:
+        try:
+            with profiler.stage("stream") as rec:
+                summary = stream_transactions(file, matcher, keep_rows=keep_rows)
+                rec.rows = summary.rows
+        except Exception as e:
+            st.error(f"Error Processing the File 😔 : {str(e)}")
+            return None
+        st.session_state.stream_summary = summary
+        st.session_state.stream_key = stream_key
+    return st.session_state.stream_summary
+
+def show_streamed_summary(summary):
+    # Summary-only view for streamed statements: everything is drawn from the running aggregates
+    st.title("💹 Transaction Summary 💵")
+    st.caption(f"{summary.rows:,} transactions streamed")
+    show_reconciliation(summary.reconciliation.summary())
+    flagged = summary.reconciliation.flagged_rows()
+    if len(flagged) and st.checkbox("Show flagged rows", key="stream_flagged"):
+        st.write(flagged)
+
+    tab1, tab2 = st.tabs(["Amount Taken (Withdraw)", "Amount Remaining (Balance)"])
+    for tab, column in ((tab1, "Withdrawls"), (tab2, "Balance")):
+        with tab:
+            category_total = summary.category_totals(column).sort_values(by=column, ascending=False)
+            st.dataframe(
+                category_total,
+                column_config={
+                    column: st.column_config.NumberColumn(column, format="%.2f AED"),
+                },
+                hide_index=True,
+                use_container_width=True)
+
+            date_bar_chart(summary.per_day.reset_index(), column,
+                           how="sum" if column == "Withdrawls" else "last", key=f"stream_zoom_{column}")
+
+            with profiler.stage("figure"):
+                fig = px.pie(category_total, values=column, names="Category", title="")
+            plot_chart(fig)
+
+            col1, col2, col3 = st.columns([3,2,1])
+            with col3:
+                if column == "Withdrawls":
+                    st.metric(label="💲Total Withdrawal💲", value=f"${summary.per_category[column].sum():,.2f}")
+                else:
+                    st.metric(label="💲Closing Balance💲", value=f"${summary.closing_balance or 0:,.2f}")
+
+
+def show_profile_panel():
+    # Drawn after main() so the current rerun is already complete
+    with st.sidebar.expander("⏱️ Stage timings"):
+        st.toggle("Profile stages", key="profiling",
+                  help="Time every stage of each rerun (adds a little overhead while on)")
+        st.checkbox("Save a cProfile file per rerun", key="profile_dump",
+                    disabled=not st.session_state.get("profiling"),
+                    help=f"Written to {PROFILE_DIR}")
+        run = profiler.last_run()
+        if run is None or not st.session_state.get("profiling"):
+            return
+        st.metric(f"Rerun #{run.number}", f"{run.seconds * 1000:,.0f} ms",
+                  help=f"Peak traced memory {run.peak / 1e6:,.1f} MB")
+        st.dataframe(run.frame(), hide_index=True, use_container_width=True,
+                     column_config={"ms": st.column_config.NumberColumn("ms", format="%.1f"),
+                                    "Δ MB": st.column_config.NumberColumn("Δ MB", format="%.2f")})
+        if len(profiler.history) > 1:
+            st.caption("Recent reruns (ms per stage)")
+            st.bar_chart(profiler.history_frame())
+        if run.profile_file:
+            st.caption(f"Profile saved to {run.profile_file}")
+
 
 def main():
     st.title("🔥 Transaction Analyzer / " +
             "Simple Dashboard📊")
-    uploaded_file = st.file_uploader("Upload your bank transactions CSV file", type=["csv"])
-    if uploaded_file is not None:
-        df = load_transactions(uploaded_file)
+    show_memory_report()
+    st.sidebar.radio("Keyword matching", ["Exact", "Fuzzy"], key="match_mode", horizontal=True,
+                     help="Fuzzy also matches descriptions with extra terminal IDs or suffixes")
+    streaming = st.sidebar.toggle("Streaming mode (large statements)",
+                                  help="Reads the file in chunks and keeps only running totals")
+    keep_rows = streaming and st.sidebar.checkbox("Load rows for the editor", value=False)
+    merge = st.sidebar.toggle("Merge several statements",
+                              help="Combine overlapping exports into one ledger, dropping duplicate transactions")
+    uploaded_file, uploaded_files = None, []
+    if merge:
+        uploaded_files = st.file_uploader("Upload your bank transactions CSV files", type=["csv"],
+                                          accept_multiple_files=True)
+    else:
+        uploaded_file = st.file_uploader("Upload your bank transactions CSV file", type=["csv"])
+    if uploaded_file is not None or uploaded_files:
+        if uploaded_files:
+            with profiler.stage("merge"):
+                df, source_key = merge_statements(uploaded_files)
+        elif streaming:
+            source_key = file_key(uploaded_file.getvalue())
+            summary = stream_statement(uploaded_file, source_key, keep_rows)
+            if summary is None:
+                return
+            if not keep_rows:
+                show_streamed_summary(summary)
+                return
+            df = summary.frame
+        else:
+            source_key = file_key(uploaded_file.getvalue())
+            df = load_transactions(uploaded_file, source_key)
         st.title("💹 Transaction History 💵")
-        st.write(df)
         if df is not None:
-            st.session_state.main_df = df.copy()
-            withdraw_df = df["Withdrawls"].copy()
-            balance_df = df["Balance"].copy()
-            
-            st.session_state.withdraw_df = withdraw_df.copy()
-            st.session_state.balance_df = balance_df.copy()
+            flags, drift, result = get_reconciliation(source_key, df)
+            show_reconciliation(result)
+            with profiler.stage("table", rows=len(df)):
+                if st.checkbox("Show only flagged rows", key="flagged_only"):
+                    flagged = flags.any(axis=1).to_numpy().nonzero()[0]
+                    rows = flagged[table_page(len(flagged), "history_flagged")]
+                    page = df.iloc[rows].join(flags.iloc[rows]).assign(Drift=drift.iloc[rows])
+                else:
+                    page = df.iloc[table_page(len(df), "history")]
+                st.dataframe(page, use_container_width=True)
+        if df is not None:
+            get_compact_ledger(source_key, df)
+            cube = get_rollup(source_key, df)
             
-            tab1,tab2,tab3 = st.tabs(["Amount Taken (Withdraw)","Amount Remaining (Balance)","Add Categories"])
+            tab1,tab2,tab3,tab4 = st.tabs(["Amount Taken (Withdraw)","Amount Remaining (Balance)","Recurring","Add Categories"])
             with tab1: 
-                edited_df1 = st.data_editor(
-                    st.session_state.main_df[["Date", "Description", "Withdrawls", "Category"]],
+                suggested, confidence = get_suggestions(source_key, df)
+                edited_df1 = paged_editor(
+                    ["Date", "Description", "Withdrawls", "Category"],
+                    amount_column="Withdrawls",
+                    key="category_editor",
                     column_config={
                         "Withdrawls": st.column_config.NumberColumn("Withdrawls", format="%.2f AED"),
                         "Category": st.column_config.SelectboxColumn(
                             "Category",
                             options=list(st.session_state.categories.keys())
-                        )
+                        ),
+                        "Confidence": st.column_config.ProgressColumn("Confidence", min_value=0.0, max_value=1.0)
                     },
-                    hide_index=True,
-                    use_container_width=True,
-                    key="category_editor"
+                    extra={"Suggested": suggested, "Confidence": confidence},
+                    disabled=["Suggested", "Confidence"]
                 )
                 
                 save_button1 = st.button("Apply Changes", type="primary", key="apply_changes_button_1")
                 if save_button1:
-                    for idx, row in edited_df1.iterrows():
-                        new_category = row["Category"]
-                        if new_category == st.session_state.main_df.at[idx, "Category"]:
-                            continue
-                        
-                        details = row["Description"]
-                        st.session_state.main_df.at[idx, "Category"] = new_category
-                        add_keyword(new_category, details)
-                        
+                    apply_changes(edited_df1)
+
+                col1, col2 = st.columns([3,1])
+                with col1:
+                    threshold = st.slider("Accept suggestions with confidence of at least", 0.5, 1.0, 0.9, 0.01)
+                with col2:
+                    if st.button(f"Apply {int((confidence >= threshold).sum()):,} Suggestions", key="apply_suggestions"):
+                        apply_suggestions(suggested, confidence, threshold)
                         
                 st.subheader("")
                 st.subheader("Withdrawl Summary")
-                category_total = df.groupby("Category")["Withdrawls"].sum().reset_index()
+                category_total = cube.category_totals("Withdrawls")
                 category_total = category_total.sort_values(by="Withdrawls", ascending=False)
                 st.dataframe(
                     category_total,
@@ -116,31 +538,22 @@ def main():
                 
                 st.subheader("")
                 st.subheader("💸 Withdrawals Chart (In Terms of Date) 💸")
-                fig = px.bar(
-                    withdraw_df,
-                    x=df["Withdrawls"],
-                    y=df["Date"],
-                    orientation="h",
-                    title="",
-                    text_auto=True,
-                    color=df["Withdrawls"],  # Color bars based on amount
-                    color_continuous_scale="Blues"  # Nice color theme
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                date_bar_chart(chart_frame(df), "Withdrawls", how="sum", key="withdraw_zoom")
                 
                 st.subheader("")
                 st.subheader("💸 Withdrawals Chart (In Terms of Expenses) 💸")
-                fig = px.pie(
-                    category_total,
-                    values="Withdrawls",
-                    names="Category",
-                    title=""
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                with profiler.stage("figure"):
+                    fig = px.pie(
+                        category_total,
+                        values="Withdrawls",
+                        names="Category",
+                        title=""
+                    )
+                plot_chart(fig)
                 
                 
                 st.subheader("")
-                total = df["Withdrawls"].sum()
+                total = cube.total("Withdrawls")
                 col1, col2, col3 = st.columns([3,2,1])
                 with col3:
                     st.metric(label="💲Total Withdrawal💲", value=f"${total:,.2f}")
@@ -150,36 +563,26 @@ def main():
                 
             with tab2:
                 
-                edited_df2 = st.data_editor(
-                    st.session_state.main_df[["Date", "Description", "Balance", "Category"]],
-                    
+                edited_df2 = paged_editor(
+                    ["Date", "Description", "Balance", "Category"],
+                    amount_column="Balance",
+                    key="category_editor2",
                     column_config={
                         "Balance": st.column_config.NumberColumn("Balance", format="%.2f AED"),
                         "Category": st.column_config.SelectboxColumn(
                             "Category",
                             options=list(st.session_state.categories.keys())
                         )
-                    },
-                    hide_index=True,
-                    use_container_width=True,
-                    key="category_editor2"
+                    }
                 )
                 
                 save_button2 = st.button("Apply Changes", type="primary", key="apply_changes_button_2")
                 if save_button2:
-                    for idx, row in edited_df1.iterrows():
-                        new_category = row["Category"]
-                        if new_category == st.session_state.main_df.at[idx, "Category"]:
-                            continue
-                        
-                        details = row["Description"]
-                        st.session_state.main_df.at[idx, "Category"] = new_category
-                        add_keyword(new_category, details)
-                        
+                    apply_changes(edited_df2)
                         
                 st.subheader("")
                 st.subheader("Balance Summary")
-                category_total = df.groupby("Category")["Balance"].sum().reset_index()
+                category_total = cube.category_totals("Balance")
                 category_total = category_total.sort_values(by="Balance", ascending=False)
                 st.dataframe(
                     category_total,
@@ -192,34 +595,27 @@ def main():
                 
                 st.subheader("")
                 st.subheader("💸 Balance Chart (In Terms of Date) 💸")
-                fig = px.bar(
-                    withdraw_df,
-                    x=df["Balance"],
-                    y=df["Date"],
-                    orientation="h",
-                    title="",
-                    text_auto=True,
-                    color=df["Balance"],  # Color bars based on amount
-                    color_continuous_scale="Blues"  # Nice color theme
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                date_bar_chart(chart_frame(df), "Balance", how="last", key="balance_zoom")
                 
                 st.subheader("")
                 st.subheader("💸 Balance Chart (In Terms of Expenses) 💸")
-                fig = px.pie(
-                    category_total,
-                    values="Balance",
-                    names="Category",
-                    title=""
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                with profiler.stage("figure"):
+                    fig = px.pie(
+                        category_total,
+                        values="Balance",
+                        names="Category",
+                        title=""
+                    )
+                plot_chart(fig)
                 
                 st.subheader("")
-                total = df["Balance"].sum()
+                total = cube.total("Balance")
                 col1, col2, col3 = st.columns([3,2,1])
                 with col3:
                     st.metric(label="💲Total Balance💲", value=f"${total:,.2f}")
             with tab3:
+                show_recurring(get_recurring(source_key, df))
+            with tab4:
                 
                 st.markdown("<h1 style='text-align: center;'>💰 Categorize Your Transactions 💰</h1>", unsafe_allow_html=True)
                 new_category = st.text_input("New Category Name")
@@ -227,14 +623,20 @@ def main():
                 
                 if add_button and new_category:
                     if new_category not in st.session_state.categories:
-                        st.session_state.categories[new_category] = []
+                        get_rule_registry().add_category(new_category)
                         save_categories()
                         
                         st.rerun()
             
                 
                             
-main()
+profiler.start_run(st.session_state.get("profiling", False),
+                   PROFILE_DIR if st.session_state.get("profile_dump") else None)
+try:
+    main()
+finally:
+    profiler.finish_run()
+show_profile_panel()
 
 
 
@@ -1,66 +1,132 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-import json
-import os
+import io
+
+from amounts import read_statement
+from categorizer import CategoryMatcher
+from paged_editor import PAGE_SIZES
+from fx import FxTable, LazyConverter
+from rollup import RollupCube
+from rules import RuleRegistry
+from transaction_cache import CACHE_DIR, TransactionCache, file_key, rules_version
+from chart_data import POINT_BUDGET, downsample, to_dates, window
 
 # Set page configuration for modern look
 st.set_page_config(page_title="Bank Transactions Automation", page_icon="💰", layout="wide")
 
-category_file = "Pycharm\Python Project\Beginner Project\Bank Transactions Automation\Main\categories.json"
-
-if "categories" not in st.session_state:
-    st.session_state.categories = {
-        'Uncategorized': []
-    }
+@st.cache_resource
+def get_rule_registry():
+    # One per server: categories.json (or BANK_CATEGORIES_FILE) is only re-read when it changes
+    return RuleRegistry()
 
-if os.path.exists(category_file):
-    with open(category_file, 'r') as f:
-        st.session_state.categories = json.load(f)
+st.session_state.categories = get_rule_registry().current().categories
 
 def save_categories():
-    with open(category_file, 'w') as f:
-        json.dump(st.session_state.categories, f)
+    # Writes everything recorded since the last save in one append
+    get_rule_registry().flush()
 
 def add_keyword(category, keyword):
-    if keyword not in st.session_state.categories[category]:
-        st.session_state.categories[category].append(keyword)
-        save_categories()
-        return True
-    return False
+    # Recorded only; call save_categories() once the whole batch is in
+    return get_rule_registry().add_keyword(category, keyword)
+
+@st.cache_resource
+def get_transaction_cache():
+    # Shared by every session on this server; set BANK_CACHE_DIR to also keep entries on disk
+    return TransactionCache(max_entries=8, cache_dir=CACHE_DIR)
 
-def load_transactions(file):
+def parse_transactions(data):
+    return read_statement(io.BytesIO(data))
+
+def load_transactions(file, key):
     try:
-        df = pd.read_csv(file)
-        df.columns = [col.strip() for col in df.columns]
-        df["Deposits"] = df["Deposits"].str.replace(",", "").astype(float)
-        df["Withdrawls"] = df["Withdrawls"].str.replace(",", "").astype(float)
-        df["Balance"] = df["Balance"].str.replace(",", "").astype(float)
-        return categorize_transaction(df)
+        # Reruns with the same upload come straight from the cache; key is the upload's
+        # file_key, hashed once per rerun by the caller
+        return get_transaction_cache().load(
+            file.getvalue(),
+            category_mapping,
+            parse=parse_transactions,
+            categorize=categorize_transaction,
+            matcher=get_category_matcher(),
+            version=CATEGORY_VERSION,
+            key=key,
+        )
     except Exception as e:
         st.error(f"Error Processing the File 😔 : {str(e)}")
 
+category_mapping = {
+    "Income": ["NEFT", "RTGS", "ATM", "Interest", "Reversal"],
+    "Expenses": ["Purchase", "Bill", "Tax", "Debit Card", "Commission"],
+    "Transfers": ["IMPS", "Transfer", "Cheque"],
+    "Miscellaneous": ["Miscellaneous", "Cash"],
+    "Service Fees & Deductions": ["Charges", "Commission", "Reversal", "Debit Card", "Tax"]
+}
+
+# Keywords shared between categories (Commission, Reversal, Debit Card, Tax) go to the first one listed here
+category_priority = ["Service Fees & Deductions", "Miscellaneous", "Transfers", "Expenses", "Income"]
+CATEGORY_VERSION = rules_version({category: category_mapping[category] for category in category_priority})
+
+# Compiled once per server process rather than on every rerun
+@st.cache_resource
+def get_category_matcher():
+    return CategoryMatcher(category_mapping, mode="substring", priority=category_priority)
+
 def categorize_transaction(df):
-    category_mapping = {
-        "Income": ["NEFT", "RTGS", "ATM", "Interest", "Reversal"],
-        "Expenses": ["Purchase", "Bill", "Tax", "Debit Card", "Commission"],
-        "Transfers": ["IMPS", "Transfer", "Cheque"],
-        "Miscellaneous": ["Miscellaneous", "Cash"],
-        "Service Fees & Deductions": ["Charges", "Commission", "Reversal", "Debit Card", "Tax"]
-    }
-
-    df["Category"] = "Uncategorized"
-    for category, keywords in category_mapping.items():
-        for idx, row in df.iterrows():
-            description = str(row["Description"]).lower()  # Ensure case-insensitivity
-            if any(keyword.lower() in description for keyword in keywords):
-                df.at[idx, "Category"] = category
-    return df
-
-# Convert AED to USD
-def convert_to_usd(amount_aed):
-    conversion_rate = 0.27  # Example conversion rate from AED to USD
-    return amount_aed * conversion_rate
+    # Substring match of every keyword in one automaton pass per distinct description
+    return get_category_matcher().categorize_frame(df)
+
+# Exchange rates by date (Files/fx_rates.csv), shared by every session
+@st.cache_resource
+def get_fx_table():
+    return FxTable.from_csv()
+
+def get_rollup(key, df):
+    # Built once per upload; later reruns only move the rows whose Category changed
+    if st.session_state.get("rollup_key") != key:
+        st.session_state.rollup = RollupCube(df)
+        st.session_state.rollup_key = key
+    else:
+        st.session_state.rollup.sync(df["Category"])
+    return st.session_state.rollup
+
+def table_page(count, key):
+    # Page picker for a read-only table: only the returned slice of rows goes to the browser
+    col1, col2 = st.columns([3, 1])
+    size = col2.selectbox("Rows per page", PAGE_SIZES, index=2, key=f"{key}_size")
+    pages = max(1, -(-count // size))
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    number = col1.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, key=f"{key}_page")
+    start = (number - 1) * size
+    st.caption(f"Rows {min(start + 1, count):,}-{min(start + size, count):,} of {count:,}")
+    return slice(start, start + size)
+
+def get_converter(key, df, currency):
+    # Kept per upload and currency, so rates and converted columns survive reruns
+    converter_key = (key, currency)
+    if st.session_state.get("converter_key") != converter_key:
+        # Dates are parsed here, once, so rates_for, window and downsample get datetime64
+        df = df.assign(Date=to_dates(df["Date"]))
+        st.session_state.converter = LazyConverter(df, get_fx_table(), currency)
+        st.session_state.converter_key = converter_key
+    return st.session_state.converter
+
+# Line chart thinned to the point budget (LTTB per category); zooming in restores every point
+def trend_chart(df, column, title, label, key):
+    dates = to_dates(df["Date"])
+    if dates.notna().any() and dates.min() < dates.max():
+        lo, hi = dates.min().date(), dates.max().date()
+        start, end = st.slider("Zoom (date range)", min_value=lo, max_value=hi, value=(lo, hi), key=key)
+        df = window(df, start, end)
+
+    points = downsample(df[["Date", column, "Category"]], column, budget=POINT_BUDGET, by="Category")
+    if len(points) < len(df):
+        st.caption(f"Showing {len(points):,} of {len(df):,} points - narrow the date range for full detail")
+
+    fig = px.line(points, x="Date", y=column, color="Category", title=title,
+                  labels={column: label, "Date": "Date"},
+                  hover_data=["Date", column, "Category"])  # Hover effect showing date, amount, and category
+    fig.update_traces(mode='lines+markers', line=dict(width=2), marker=dict(size=5))  # Add markers and lines
+    st.plotly_chart(fig, use_container_width=True)
 
 # Main function with modern UI and updated graphs
 def main():
@@ -68,20 +134,23 @@ def main():
     uploaded_file = st.file_uploader("Upload your bank transactions CSV file", type=["csv"])
 
     if uploaded_file is not None:
-        df = load_transactions(uploaded_file)
+        source_key = file_key(uploaded_file.getvalue())
+        df = load_transactions(uploaded_file, source_key)
         st.title("💹 Transaction History 💵")
-        st.write(df)
 
         if df is not None:
-            # Convert columns to USD
-            df["Withdrawls (USD)"] = df["Withdrawls"].apply(convert_to_usd)
-            df["Balance (USD)"] = df["Balance"].apply(convert_to_usd)
-            
-            st.session_state.main_df = df.copy()
-            withdraw_df = df["Withdrawls (USD)"].copy()
-            balance_df = df["Balance (USD)"].copy()
-            st.session_state.withdraw_df = withdraw_df.copy()
-            st.session_state.balance_df = balance_df.copy()
+            st.dataframe(df.iloc[table_page(len(df), "history")], use_container_width=True)
+
+            # Converted columns are only built when a chart asks for them;
+            # the totals are converted per day straight from the rollup
+            fx_table = get_fx_table()
+            currencies = fx_table.currencies()
+            currency = st.sidebar.selectbox("Display currency", currencies,
+                                            index=currencies.index("USD") if "USD" in currencies else 0)
+            converter = get_converter(source_key, df, currency)
+
+            cube = get_rollup(source_key, df)
+            day_rates = fx_table.rates_for(cube.days, currency)
 
             # Using tabs to organize different views
             tab1, tab2, tab3 = st.tabs(["Withdrawals", "Balance", "Add Categories"])
@@ -89,54 +158,50 @@ def main():
             # Withdrawals Tab
             with tab1:
                 st.subheader("💸 Withdrawals Overview")
-                category_total = df.groupby("Category")["Withdrawls (USD)"].sum().reset_index()
-                category_total = category_total.sort_values(by="Withdrawls (USD)", ascending=False)
+                category_total = cube.category_totals("Withdrawls", day_weights=day_rates)
+                category_total = category_total.rename(columns={"Withdrawls": converter.name("Withdrawls")})
+                category_total = category_total.sort_values(by=converter.name("Withdrawls"), ascending=False)
                 st.dataframe(category_total, use_container_width=True)
 
                 # Line graph for Withdrawals Trend over Time with categories
                 st.subheader("📈 Withdrawals Trend Over Time")
-                fig1 = px.line(df, x="Date", y="Withdrawls (USD)", color="Category", title="Withdrawals Trend",
-                               labels={"Withdrawls (USD)": "Amount Withdrawn (USD)", "Date": "Date"},
-                               hover_data=["Date", "Withdrawls (USD)", "Category"])  # Hover effect showing date, amount, and category
-                fig1.update_traces(mode='lines+markers', line=dict(width=2), marker=dict(size=5))  # Add markers and lines
-                st.plotly_chart(fig1, use_container_width=True)
+                trend_chart(converter.frame("Withdrawls"), converter.name("Withdrawls"), "Withdrawals Trend",
+                            f"Amount Withdrawn ({currency})", key="withdraw_zoom")
 
                 # Withdrawals Breakdown by Category (Pie Chart)
                 st.subheader("📊 Withdrawals by Category")
-                fig2 = px.pie(category_total, values="Withdrawls (USD)", names="Category", title="Withdrawals Breakdown")
+                fig2 = px.pie(category_total, values=converter.name("Withdrawls"), names="Category", title="Withdrawals Breakdown")
                 st.plotly_chart(fig2, use_container_width=True)
 
                 # Total Withdrawals Summary (in columns for better layout)
-                total_withdrawals = df["Withdrawls (USD)"].sum()
+                total_withdrawals = cube.total("Withdrawls", day_weights=day_rates)
                 col1, col2, col3 = st.columns([3, 2, 1])
                 with col3:
-                    st.metric(label="💲Total Withdrawn💲", value=f"${total_withdrawals:,.2f}")
+                    st.metric(label="💲Total Withdrawn💲", value=f"{total_withdrawals:,.2f} {currency}")
 
             # Balance Tab
             with tab2:
                 st.subheader("💸 Balance Overview")
-                category_total = df.groupby("Category")["Balance (USD)"].sum().reset_index()
-                category_total = category_total.sort_values(by="Balance (USD)", ascending=False)
+                category_total = cube.category_totals("Balance", day_weights=day_rates)
+                category_total = category_total.rename(columns={"Balance": converter.name("Balance")})
+                category_total = category_total.sort_values(by=converter.name("Balance"), ascending=False)
                 st.dataframe(category_total, use_container_width=True)
 
                 # Line graph for Balance Trend over Time with categories
                 st.subheader("📈 Balance Trend Over Time")
-                fig3 = px.line(df, x="Date", y="Balance (USD)", color="Category", title="Balance Trend",
-                               labels={"Balance (USD)": "Account Balance (USD)", "Date": "Date"},
-                               hover_data=["Date", "Balance (USD)", "Category"])  # Hover effect showing date, balance, and category
-                fig3.update_traces(mode='lines+markers', line=dict(width=2), marker=dict(size=5))  # Add markers and lines
-                st.plotly_chart(fig3, use_container_width=True)
+                trend_chart(converter.frame("Balance"), converter.name("Balance"), "Balance Trend",
+                            f"Account Balance ({currency})", key="balance_zoom")
 
                 # Balance Breakdown by Category (Donut Chart)
                 st.subheader("📊 Balance by Category")
-                fig4 = px.pie(category_total, values="Balance (USD)", names="Category", title="Balance Breakdown", hole=0.4)
+                fig4 = px.pie(category_total, values=converter.name("Balance"), names="Category", title="Balance Breakdown", hole=0.4)
                 st.plotly_chart(fig4, use_container_width=True)
 
                 # Total Balance Summary
-                total_balance = df["Balance (USD)"].sum()
+                total_balance = cube.total("Balance", day_weights=day_rates)
                 col1, col2, col3 = st.columns([3, 2, 1])
                 with col3:
-                    st.metric(label="💲Total Balance💲", value=f"${total_balance:,.2f}")
+                    st.metric(label="💲Total Balance💲", value=f"{total_balance:,.2f} {currency}")
 
             # Add Categories Tab
             with tab3:
@@ -146,7 +211,7 @@ def main():
 
                 if add_button and new_category:
                     if new_category not in st.session_state.categories:
-                        st.session_state.categories[new_category] = []
+                        get_rule_registry().add_category(new_category)
                         save_categories()
                         st.success(f"Category '{new_category}' added successfully!")
                         st.rerun()
@@ -0,0 +1,62 @@
+import pandas as pd
+
+# Amount parsing for the Deposits / Withdrawls / Balance columns.
+#
+# Bank exports write amounts as quoted, comma grouped strings ("36,393.59", 00.00).
+# Instead of reading them as text and cleaning each column with str.replace +
+# astype(float), read_statement lets the CSV parser strip the thousands separator
+# while it reads, so the columns come out as float64 straight away. Only a column the
+# parser could not convert (parenthesized or trailing-minus negatives) goes through
+# one vectorized fallback pass.
+
+AMOUNT_COLUMNS = ["Deposits", "Withdrawls", "Balance"]
+
+# Header spellings seen in exports -> the name the app uses
+HEADER_ALIASES = {
+    "Withdrawals": "Withdrawls",
+    "Withdrawal": "Withdrawls",
+    "Deposit": "Deposits",
+}
+
+# Blank debit/credit cells mean nothing moved; a blank balance stays missing
+ZERO_WHEN_BLANK = ["Deposits", "Withdrawls"]
+
+
+def read_statement(source, thousands=",", decimal=".", **kwargs):
+    df = pd.read_csv(source, thousands=thousands, decimal=decimal, skipinitialspace=True, **kwargs)
+    return normalize_statement(df, thousands=thousands, decimal=decimal)
+
+
+def read_statement_chunks(source, chunksize, thousands=",", decimal=".", **kwargs):
+    reader = pd.read_csv(source, thousands=thousands, decimal=decimal, skipinitialspace=True,
+                         chunksize=chunksize, **kwargs)
+    for chunk in reader:
+        yield normalize_statement(chunk, thousands=thousands, decimal=decimal)
+
+
+def normalize_statement(df, thousands=",", decimal="."):
+    df.columns = [HEADER_ALIASES.get(col.strip(), col.strip()) for col in df.columns]
+    for col in AMOUNT_COLUMNS:
+        if col not in df.columns:
+            continue
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = parse_amounts(df[col], thousands=thousands, decimal=decimal)
+        else:
+            df[col] = df[col].astype("float64")
+        if col in ZERO_WHEN_BLANK:
+            df[col] = df[col].fillna(0.0)
+    return df
+
+
+def parse_amounts(values, thousands=",", decimal="."):
+    # Fallback for text columns: "(1,234.50)", "1,234.50-" and "-1,234.50" are all -1234.5
+    text = values.astype("string").str.strip()
+    negative = text.str.startswith("(") | text.str.endswith("-")
+    cleaned = text.str.replace(r"[()\s+-]", "", regex=True)
+    if thousands:
+        cleaned = cleaned.str.replace(thousands, "", regex=False)
+    if decimal != ".":
+        cleaned = cleaned.str.replace(decimal, ".", regex=False)
+    numbers = pd.to_numeric(cleaned.replace("", pd.NA), errors="raise").astype("float64")
+    negative = negative | text.str.startswith("-")
+    return numbers.where(~negative.fillna(False), -numbers)
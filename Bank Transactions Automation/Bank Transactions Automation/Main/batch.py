@@ -0,0 +1,141 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from amounts import read_statement
+from categorizer import CategoryMatcher
+from category_store import CategoryStore
+from rules import CATEGORY_FILE
+from transaction_cache import rules_version
+
+# Headless batch categorization of a directory of statement CSVs (no Streamlit).
+#
+#   python batch.py statements/ output/ --workers 8
+#
+# Each <name>.csv becomes <name>.categorized.csv plus <name>.summary.json in the
+# output directory. manifest.json records the sha256 of every processed input and the
+# version of the rules it was categorized with, so a re-run (or a run resumed after a
+# crash) skips files that haven't changed.
+
+MANIFEST = "manifest.json"
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def summarize(df):
+    by_category = df.groupby("Category").agg(
+        Count=("Category", "size"),
+        Deposits=("Deposits", "sum"),
+        Withdrawls=("Withdrawls", "sum"),
+    )
+    return {
+        "rows": len(df),
+        "first_date": str(df["Date"].iloc[0]) if len(df) else None,
+        "last_date": str(df["Date"].iloc[-1]) if len(df) else None,
+        "closing_balance": float(df["Balance"].iloc[-1]) if len(df) else None,
+        "categories": by_category.round(2).to_dict(orient="index"),
+    }
+
+
+def process_file(path, output_dir, categories, mode, digest):
+    start = time.perf_counter()
+    df = CategoryMatcher(categories, mode=mode).categorize_frame(read_statement(path))
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    df.to_csv(os.path.join(output_dir, stem + ".categorized.csv"), index=False)
+    summary = summarize(df)
+    summary["source"] = os.path.basename(path)
+    summary["sha256"] = digest
+    with open(os.path.join(output_dir, stem + ".summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+    return os.path.basename(path), digest, len(df), time.perf_counter() - start
+
+
+def load_manifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST)
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def pending_files(input_dir, output_dir, manifest, rules, force):
+    # (path, sha256) of every CSV that is new or changed since it was last processed
+    pending = []
+    for name in sorted(os.listdir(input_dir)):
+        if not name.lower().endswith(".csv"):
+            continue
+        path = os.path.join(input_dir, name)
+        digest = file_hash(path)
+        stem = os.path.splitext(name)[0]
+        entry = manifest.get(name, {})
+        done = entry.get("sha256") == digest and entry.get("rules") == rules and os.path.exists(
+            os.path.join(output_dir, stem + ".categorized.csv"))
+        if force or not done:
+            pending.append((path, digest))
+    return pending
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Categorize every bank statement CSV in a directory")
+    parser.add_argument("input_dir")
+    parser.add_argument("output_dir")
+    parser.add_argument("--categories", default=CATEGORY_FILE)
+    parser.add_argument("--mode", choices=["exact", "substring"], default="exact")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--force", action="store_true", help="reprocess files even if unchanged")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    categories = CategoryStore(args.categories).load()
+    rules = f"{args.mode}:{rules_version(categories)}"
+    manifest = load_manifest(args.output_dir)
+    pending = pending_files(args.input_dir, args.output_dir, manifest, rules, args.force)
+    print(f"{len(pending)} file(s) to process, {len(manifest)} already in the manifest")
+
+    start = time.perf_counter()
+    files = rows = failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(process_file, path, args.output_dir, categories, args.mode, digest): path
+            for path, digest in pending
+        }
+        for future in as_completed(futures):
+            try:
+                name, digest, count, seconds = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"FAILED {os.path.basename(futures[future])}: {e}")
+                continue
+            manifest[name] = {"sha256": digest, "rules": rules, "rows": count}
+            save_manifest(args.output_dir, manifest)
+            files += 1
+            rows += count
+            print(f"{name}: {count:,} rows in {seconds:.2f}s")
+
+    elapsed = time.perf_counter() - start
+    if elapsed > 0 and files:
+        print(f"{files} file(s), {rows:,} rows in {elapsed:.2f}s "
+              f"({files / elapsed:.1f} files/sec, {rows / elapsed:,.0f} rows/sec)")
+    if failed:
+        print(f"{failed} file(s) failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+from collections import deque
+
+import pandas as pd
+
+# Compiles every keyword from categories.json into a single matcher so the whole
+# Description column is labelled in one pass, instead of one iterrows() walk per category.
+#
+#   mode="exact"     -> a description matches a keyword when they are equal (Main.py)
+#   mode="substring" -> a description matches when it contains the keyword (Main_proj.py)
+#
+# Matching is case-insensitive. When a description matches keywords from several
+# categories, the category that comes first in `priority` wins. Categories left out of
+# `priority` follow in the order they appear in the mapping, so the default is
+# "first listed wins" rather than the old "last match wins". Edits made in the app move
+# a keyword out of its other categories (CategoryStore.add_keyword), so a description
+# the user recategorized is listed once and keeps the label they gave it.
+
+UNCATEGORIZED = "Uncategorized"
+
+
+class AhoCorasick:
+    # Multi-pattern substring automaton: a single walk over a description finds
+    # every keyword it contains. Each node keeps the best (lowest) rank of any
+    # keyword ending there, including the ones reachable through fail links.
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [None]
+
+        for pattern, rank in patterns.items():
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(None)
+                node = nxt
+            if self.out[node] is None or rank < self.out[node]:
+                self.out[node] = rank
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[child] = self.goto[f].get(ch, 0)
+                inherited = self.out[self.fail[child]]
+                if inherited is not None and (self.out[child] is None or inherited < self.out[child]):
+                    self.out[child] = inherited
+
+    def best(self, text):
+        goto, fail, out = self.goto, self.fail, self.out
+        node = 0
+        best = None
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            rank = out[node]
+            if rank is not None and (best is None or rank < best):
+                best = rank
+        return best
+
+
+class CategoryMatcher:
+
+    def __init__(self, categories, mode="exact", priority=None):
+        if mode not in ("exact", "substring"):
+            raise ValueError(f"Unknown match mode: {mode}")
+        self.mode = mode
+
+        # Explicit priority first, then the remaining categories in mapping order
+        order = [c for c in (priority or []) if c in categories]
+        order += [c for c in categories if c not in order]
+        self.order = [c for c in order if c != UNCATEGORIZED]
+
+        # keyword -> rank of the highest priority category that lists it
+        keywords = {}
+        for rank, category in enumerate(self.order):
+            for keyword in categories[category] or []:
+                keyword = str(keyword).lower()
+                if keyword and keyword not in keywords:
+                    keywords[keyword] = rank
+        self.keywords = keywords
+
+        if mode == "exact":
+            self.lookup = {k: self.order[r] for k, r in keywords.items()}
+        else:
+            self.automaton = AhoCorasick(keywords)
+
+    def match(self, description):
+        # Label a single description
+        text = str(description).lower()
+        if self.mode == "exact":
+            return self.lookup.get(text, UNCATEGORIZED)
+        rank = self.automaton.best(text)
+        return UNCATEGORIZED if rank is None else self.order[rank]
+
+    def categorize(self, descriptions):
+        descriptions = pd.Series(descriptions)
+        if self.mode == "exact":
+            labels = descriptions.astype(str).str.lower().map(self.lookup)
+            return labels.fillna(UNCATEGORIZED).rename("Category")
+
+        # Statements repeat the same descriptions over and over, so run the
+        # automaton once per distinct value and broadcast the labels back
+        codes, uniques = pd.factorize(descriptions)
+        labels = [self.match(value) for value in uniques]
+        labels.append(UNCATEGORIZED)  # code -1 (missing description)
+        return pd.Series(labels, dtype=object).take(codes).set_axis(descriptions.index).rename("Category")
+
+    def categorize_frame(self, df, column="Description"):
+        df["Category"] = self.categorize(df[column]).values
+        return df
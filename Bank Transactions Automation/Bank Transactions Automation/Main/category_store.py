@@ -0,0 +1,151 @@
+import json
+import os
+
+# Keeps categories.json in memory and persists changes through an append-only journal.
+#
+# add_keyword / add_category only record the change; flush() appends everything
+# recorded since the last flush to "<categories file>.journal" in a single write
+# (one flush per "Apply Changes" click). Once the journal grows past `compact_every`
+# entries it is folded back into categories.json, written to a temp file and renamed
+# over the original so readers never see a half-written file.
+# load() only re-reads from disk when the size or mtime of either file has changed.
+# In memory each category's keywords are an insertion-ordered dict (keyword -> None), with
+# a lower-cased keyword -> {(category, keyword)} index beside them, so adding, moving and
+# replaying a keyword are O(1) and a batch of edits costs time linear in its size. The
+# plain {category: [keywords]} mapping is rebuilt from them once per change, when read.
+# A keyword belongs to one category: add_keyword moves it, journalling a "remove" for
+# every other category that listed it (case-insensitively, as the matchers compare).
+
+
+class CategoryStore:
+
+    def __init__(self, path, compact_every=500):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compact_every = compact_every
+        self._keywords = {}  # category -> {keyword: None}, in file order
+        self._owners = {}  # lower-cased keyword -> {(category, keyword)}
+        self._lists = None
+        self._reset({"Uncategorized": []})
+        self.pending = []
+        self.journal_entries = 0
+        self.changes = 0  # bumped whenever `categories` changes, from disk or from add_*
+        self._stamp = None
+
+    def _stat(self):
+        stamp = []
+        for path in (self.path, self.journal_path):
+            try:
+                info = os.stat(path)
+                stamp.append((info.st_mtime_ns, info.st_size))
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def load(self):
+        stamp = self._stat()
+        if stamp == self._stamp:
+            return self.categories
+
+        categories = {"Uncategorized": []}
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                categories = json.load(f)
+        self._reset(categories)
+
+        self.journal_entries = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        self._apply(json.loads(line))
+                        self.journal_entries += 1
+
+        # Changes recorded but not flushed yet stay visible
+        for change in self.pending:
+            self._apply(change)
+
+        self.changes += 1
+        self._stamp = stamp
+        return self.categories
+
+    @property
+    def categories(self):
+        if self._lists is None:
+            self._lists = {category: list(keywords) for category, keywords in self._keywords.items()}
+        return self._lists
+
+    def _reset(self, categories):
+        self._keywords, self._owners, self._lists = {}, {}, None
+        for category, keywords in categories.items():
+            self._apply({"op": "category", "category": category})
+            for keyword in keywords or []:
+                self._apply({"op": "keyword", "category": category, "keyword": keyword})
+
+    def _apply(self, change):
+        category = change["category"]
+        if change["op"] == "category":
+            self._keywords.setdefault(category, {})
+        elif change["op"] == "keyword":
+            keyword = change["keyword"]
+            keywords = self._keywords.setdefault(category, {})
+            if keyword not in keywords:
+                keywords[keyword] = None
+                self._owners.setdefault(str(keyword).lower(), set()).add((category, keyword))
+        elif change["op"] == "remove":
+            keyword = change["keyword"]
+            if keyword in self._keywords.get(category, {}):
+                del self._keywords[category][keyword]
+                owners = self._owners[str(keyword).lower()]
+                owners.discard((category, keyword))
+                if not owners:
+                    del self._owners[str(keyword).lower()]
+        self._lists = None
+
+    def _record(self, change):
+        self._apply(change)
+        self.pending.append(change)
+        self.changes += 1
+
+    def add_category(self, category):
+        if category in self._keywords:
+            return False
+        self._record({"op": "category", "category": category})
+        return True
+
+    def add_keyword(self, category, keyword):
+        # Moves `keyword` to `category`; True when anything changed
+        # Current owners come from the lower-cased index, not from scanning the categories
+        owners = self._owners.get(str(keyword).lower(), ())
+        moved = sorted((other, existing) for other, existing in owners if other != category)
+        for other, existing in moved:
+            self._record({"op": "remove", "category": other, "keyword": existing})
+        removed = bool(moved)
+        if keyword in self._keywords.get(category, {}):
+            return removed
+        self._record({"op": "keyword", "category": category, "keyword": keyword})
+        return True
+
+    def flush(self):
+        if not self.pending:
+            return 0
+        written = len(self.pending)
+        with open(self.journal_path, "a") as f:
+            f.write("".join(json.dumps(change) + "\n" for change in self.pending))
+        self.pending = []
+        self.journal_entries += written
+        if self.journal_entries >= self.compact_every:
+            self.compact()
+        self._stamp = self._stat()
+        return written
+
+    def compact(self):
+        self.load()  # pick up entries other sessions appended since our last read
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.categories, f)
+        os.replace(tmp, self.path)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self.journal_entries = 0
+        self._stamp = self._stat()
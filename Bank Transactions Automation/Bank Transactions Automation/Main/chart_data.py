@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+# Chart data layer: keeps the Plotly payload small no matter how many rows a statement has.
+#
+#  - bucket_totals pre-aggregates by day / week / month, the bucket being picked from
+#    the date range so a chart never has more than a few hundred bars.
+#  - downsample thins line charts to a fixed point budget with LTTB
+#    (Largest-Triangle-Three-Buckets), which keeps peaks and dips visible.
+#  - Both only kick in above the budget, so a zoomed-in window small enough to draw
+#    is shown transaction by transaction.
+# Every helper reads Date through to_dates, which returns datetime64 columns as they are:
+# callers pass frames whose Date is already parsed (the CompactLedger's dates, or a frame
+# parsed once per upload), so a chart never re-parses date strings on a rerun.
+
+POINT_BUDGET = 2000
+DATE_FORMAT = "%d-%b-%Y"
+
+# (longest span in days, pandas period) from finest to coarsest
+BUCKETS = [(120, "D"), (3 * 365, "W"), (None, "M")]
+BUCKET_NAMES = {"D": "Day", "W": "Week", "M": "Month"}
+
+
+def to_dates(values):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    dates = pd.to_datetime(values, format=DATE_FORMAT, errors="coerce")
+    if dates.isna().all():
+        dates = pd.to_datetime(values, format="mixed", errors="coerce")
+    return dates
+
+
+def choose_bucket(dates):
+    span = (dates.max() - dates.min()).days if len(dates) else 0
+    for limit, period in BUCKETS:
+        if limit is None or span <= limit:
+            return period
+
+
+def bucket_totals(df, column, how="sum", bucket=None, by=None):
+    # how="sum" for flows (withdrawals, deposits), "last" for levels (balance)
+    dates = to_dates(df["Date"])
+    bucket = bucket or choose_bucket(dates)
+    keys = [dates.dt.to_period(bucket).dt.start_time.rename("Date")]
+    if by is not None:
+        keys.append(df[by])
+    totals = df[column].groupby(keys, sort=True).agg(how).reset_index()
+    return totals, bucket
+
+
+def lttb(x, y, n):
+    # Indices of the n points LTTB keeps; x must be increasing
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+
+    edges = np.linspace(1, size - 1, n - 1).astype(np.int64)
+    keep = np.empty(n, dtype=np.int64)
+    keep[0], keep[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else size
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def downsample(df, column, budget=POINT_BUDGET, by=None):
+    # Rows of df (sorted by date) thinned to about `budget` points, split evenly across `by` groups
+    df = df.assign(Date=to_dates(df["Date"])).sort_values("Date", kind="stable")
+    if len(df) <= budget:
+        return df
+
+    groups = [df] if by is None else [g for _, g in df.groupby(by, sort=False)]
+    share = max(3, budget // len(groups))
+    parts = []
+    for group in groups:
+        x = group["Date"].to_numpy().astype("int64") / 1e9
+        y = group[column].to_numpy(dtype=float)
+        parts.append(group.iloc[lttb(x, y, share)])
+    return pd.concat(parts).sort_values("Date", kind="stable")
+
+
+def window(df, start, end):
+    # Rows between two dates (inclusive), used for zooming into the charts
+    dates = to_dates(df["Date"])
+    return df[(dates >= pd.Timestamp(start)) & (dates <= pd.Timestamp(end))]
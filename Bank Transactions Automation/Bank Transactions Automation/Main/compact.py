@@ -0,0 +1,96 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from chart_data import to_dates
+
+# Memory-lean representation of a statement for st.session_state.
+#
+# Instead of a full DataFrame plus copies of its columns, a session keeps:
+#   - Description and Category as pandas Categoricals (small integer codes + one copy of each label)
+#   - Date parsed once to datetime64
+#   - Deposits / Withdrawls / Balance in a single float64 block of shape (rows, 3)
+# Views for the editor, charts and summaries are built on demand from these arrays
+# (the amount columns of a view are slices of the block, not copies).
+
+AMOUNT_COLUMNS = ["Deposits", "Withdrawls", "Balance"]
+
+
+class CompactLedger:
+
+    def __init__(self, df):
+        self.index = df.index
+        self.dates = to_dates(df["Date"]).to_numpy(dtype="datetime64[ns]")
+        self.description = pd.Categorical(df["Description"])
+        self.category = pd.Categorical(df["Category"])
+        self.amounts = np.empty((len(df), len(AMOUNT_COLUMNS)), dtype=np.float64, order="F")
+        for i, col in enumerate(AMOUNT_COLUMNS):
+            self.amounts[:, i] = df[col].to_numpy(dtype=float)
+
+    def __len__(self):
+        return len(self.index)
+
+    def column(self, name):
+        if name == "Date":
+            values = self.dates
+        elif name == "Description":
+            values = self.description
+        elif name == "Category":
+            values = self.category
+        else:
+            values = self.amounts[:, AMOUNT_COLUMNS.index(name)]
+        return pd.Series(values, index=self.index, name=name, copy=False)
+
+    def view(self, *columns):
+        columns = columns or ["Date", "Description"] + AMOUNT_COLUMNS + ["Category"]
+        return pd.DataFrame({name: self.column(name) for name in columns}, copy=False)
+
+    def set_categories(self, index, values):
+        # Recategorize some rows (by index label); new category names are added on the fly
+        values = pd.Series(values, index=index)
+        missing = [c for c in pd.unique(values) if c not in self.category.categories]
+        if missing:
+            self.category = self.category.add_categories(missing)
+        positions = self.index.get_indexer(index)
+        codes = self.category.codes.copy()
+        codes[positions] = self.category.categories.get_indexer(values)
+        self.category = pd.Categorical.from_codes(codes, self.category.categories)
+
+    def sync_categories(self, categories):
+        # Take a freshly categorized column, touching only the rows that differ
+        labels = np.asarray(categories, dtype=object)
+        current = np.asarray(self.category, dtype=object)
+        changed = np.flatnonzero(labels != current)
+        if len(changed):
+            self.set_categories(self.index[changed], labels[changed])
+        return len(changed)
+
+    def nbytes(self):
+        return int(
+            self.dates.nbytes
+            + self.description.nbytes
+            + self.category.nbytes
+            + self.amounts.nbytes
+            + self.index.memory_usage(deep=True)
+        )
+
+
+def object_size(value):
+    # Best-effort size of a session_state entry in bytes
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if hasattr(value, "nbytes") and callable(value.nbytes):
+        return int(value.nbytes())
+    return sys.getsizeof(value)
+
+
+def memory_report(state):
+    # One row per session_state key, largest first
+    rows = [(str(key), type(value).__name__, object_size(value)) for key, value in state.items()]
+    report = pd.DataFrame(rows, columns=["Key", "Type", "Bytes"])
+    return report.sort_values("Bytes", ascending=False).reset_index(drop=True)
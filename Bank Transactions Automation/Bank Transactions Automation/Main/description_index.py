@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+# Inverted index from normalized Description to row positions, built once per loaded statement.
+#
+# When a keyword is added to (or moved between) categories only the rows whose
+# description matches that keyword can change label, so instead of re-running the
+# matcher over the whole column we look those rows up here and relabel just them.
+# A move shows up as the keyword leaving one category and joining another. Reordering
+# the categories changes which one wins for every shared keyword, so that case asks
+# for a full recategorization instead.
+# The index is built from the Description codes a cached statement already holds
+# (TransactionCache builds it with the entry), and retag patches integer label codes in
+# place, so a keyword change costs in proportion to the rows it matches.
+
+
+def changed_keywords(old_categories, new_categories):
+    # Lowercased keywords whose category membership differs between two versions of the rules,
+    # or None when the categories were reordered and every row has to be relabelled
+    kept = [c for c in old_categories if c in new_categories]
+    if kept != [c for c in new_categories if c in old_categories]:
+        return None
+
+    def memberships(categories):
+        return {(str(k).lower(), c) for c, keywords in categories.items() for k in keywords or []}
+
+    before, after = memberships(old_categories), memberships(new_categories)
+    return {keyword for keyword, _ in before ^ after}
+
+
+class DescriptionIndex:
+
+    def __init__(self, codes, uniques):
+        # codes: position of each row's description in `uniques`, -1 where it is missing.
+        # Only the distinct values are lower-cased; blank ones become "" (the last slot takes -1)
+        lowered = pd.Series(np.append(np.asarray(uniques, dtype=object), "")).fillna("").astype(str).str.lower()
+        ids, normalized = pd.factorize(lowered)
+        row_ids = ids[np.asarray(codes)]
+        self.uniques = list(normalized)
+        self.positions = {text: i for i, text in enumerate(self.uniques)}
+
+        # Row positions grouped by description: rows of description i are order[starts[i]:starts[i + 1]]
+        self.order = np.argsort(row_ids, kind="stable")
+        counts = np.bincount(row_ids, minlength=len(self.uniques))
+        self.starts = np.concatenate([[0], np.cumsum(counts)])
+
+    @classmethod
+    def from_descriptions(cls, descriptions):
+        codes, uniques = pd.factorize(pd.Series(descriptions))
+        return cls(codes, uniques)
+
+    def __len__(self):
+        return len(self.order)
+
+    def descriptions_matching(self, keyword, mode="exact"):
+        keyword = str(keyword).lower()
+        if mode == "exact":
+            i = self.positions.get(keyword)
+            return [] if i is None else [i]
+        if mode == "substring":
+            # Substring keywords are checked against distinct descriptions, never against rows
+            return [i for i, text in enumerate(self.uniques) if keyword in text]
+        # Fuzzy scores depend on the whole keyword set, so every distinct description is rescored
+        return range(len(self.uniques))
+
+    def rows(self, description_id):
+        return self.order[self.starts[description_id]:self.starts[description_id + 1]]
+
+    def rows_matching(self, keyword, mode="exact"):
+        ids = self.descriptions_matching(keyword, mode)
+        if not ids:
+            return np.empty(0, dtype=self.order.dtype)
+        return np.concatenate([self.rows(i) for i in ids])
+
+    def retag(self, codes, labels, keywords, matcher):
+        # Relabel only the rows whose description matches one of `keywords`: `codes` (label
+        # position per row) is patched in place and `labels` gains any label it didn't have.
+        # The new label comes from `matcher`, which must already include the change,
+        # so priorities resolve exactly as a full recategorization would.
+        ids = set()
+        for keyword in keywords:
+            ids.update(self.descriptions_matching(keyword, matcher.mode))
+
+        lookup = {label: code for code, label in enumerate(labels)}
+        changed = 0
+        for i in ids:
+            rows = self.rows(i)
+            label = matcher.match(self.uniques[i])
+            code = lookup.get(label)
+            if code is None:
+                code = lookup[label] = len(labels)
+                labels.append(label)
+            changed += int(np.count_nonzero(codes[rows] != code))
+            codes[rows] = code
+        return changed
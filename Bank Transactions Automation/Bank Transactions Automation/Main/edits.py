@@ -0,0 +1,38 @@
+import time
+
+# Change detection for the data_editor "Apply Changes" buttons.
+# The edited Category column is compared with the stored one in a single mask
+# operation; only the rows that differ are written back, and their keywords go to
+# the category store as one batch, so the cost follows the number of edits rather
+# than the size of the table.
+
+
+class EditResult:
+
+    def __init__(self, rows, keywords, seconds):
+        self.rows = rows
+        self.keywords = keywords
+        self.seconds = seconds
+
+
+def changed_mask(stored, edited_df, column="Category"):
+    # stored: the current Category column (any Series indexed like the table).
+    # Only the edited rows are picked out before converting, so the cost follows the page size
+    stored = stored.reindex(edited_df.index).astype(object)
+    return edited_df[column].notna() & edited_df[column].ne(stored)
+
+
+def apply_category_edits(ledger, edited_df, store):
+    # ledger: CompactLedger holding the session's rows
+    start = time.perf_counter()
+
+    mask = changed_mask(ledger.column("Category"), edited_df)
+    changed = edited_df.loc[mask, ["Description", "Category"]]
+    ledger.set_categories(changed.index, changed["Category"])
+
+    keywords = 0
+    for description, category in changed.drop_duplicates().itertuples(index=False):
+        keywords += store.add_keyword(category, description)
+    store.flush()
+
+    return EditResult(len(changed), keywords, time.perf_counter() - start)
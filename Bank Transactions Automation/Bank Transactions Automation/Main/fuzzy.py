@@ -0,0 +1,96 @@
+import re
+import threading
+from collections import Counter, OrderedDict
+
+import pandas as pd
+
+from categorizer import UNCATEGORIZED, CategoryMatcher
+
+# Fuzzy merchant matching for noisy descriptions ("AMAZON AE 4431 DUBAI", "DEWA*BILL 0925").
+#
+# Every keyword is split into words and each word, padded with spaces, into character
+# trigrams (" amazon " -> " am", "ama", ..., "on "). An inverted index maps trigram ->
+# keywords, so a description is only scored against keywords it shares a trigram
+# with. The score is the fraction of the keyword's trigrams found in the description:
+# extra terminal IDs and suffixes don't hurt it, while a short keyword buried inside
+# a longer word ("atm" in "treatment") loses its boundary trigrams and scores low.
+# Results are cached per distinct description, which statements repeat heavily. The
+# matcher is shared by every session (see rules.py), so the cache is an LRU of at most
+# MATCH_CACHE descriptions behind a lock.
+
+DEFAULT_THRESHOLD = 0.7
+MATCH_CACHE = 100_000
+TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def trigrams(text):
+    grams = set()
+    for word in TOKEN.findall(str(text).lower()):
+        padded = f" {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class FuzzyMatcher:
+
+    mode = "fuzzy"
+
+    def __init__(self, categories, priority=None, threshold=DEFAULT_THRESHOLD):
+        # Reuse CategoryMatcher's priority order and keyword -> rank table
+        base = CategoryMatcher(categories, mode="exact", priority=priority)
+        self.exact = base.lookup
+        self.order = base.order
+        self.threshold = threshold
+
+        self.keywords = list(base.keywords)
+        self.ranks = [base.keywords[k] for k in self.keywords]
+        self.sizes = []
+        self.index = {}
+        for i, keyword in enumerate(self.keywords):
+            grams = trigrams(keyword)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.index.setdefault(gram, []).append(i)
+        self.cache = OrderedDict()  # lower-cased description -> label, least recently used first
+        self._lock = threading.Lock()
+
+    def score(self, description):
+        # (best keyword id, score) among the keywords sharing a trigram with the description
+        shared = Counter()
+        for gram in trigrams(description):
+            shared.update(self.index.get(gram, ()))
+        best, best_key = None, None
+        for i, hits in shared.items():
+            score = hits / self.sizes[i]
+            key = (score, -self.ranks[i], self.sizes[i])  # then priority, then the longer keyword
+            if best_key is None or key > best_key:
+                best, best_key = i, key
+        return (best, best_key[0]) if best is not None else (None, 0.0)
+
+    def match(self, description):
+        text = str(description).lower()
+        with self._lock:
+            label = self.cache.get(text)
+            if label is not None:
+                self.cache.move_to_end(text)
+                return label
+        label = self.exact.get(text)
+        if label is None:
+            best, score = self.score(text)
+            label = self.order[self.ranks[best]] if best is not None and score >= self.threshold else UNCATEGORIZED
+        with self._lock:
+            self.cache[text] = label
+            if len(self.cache) > MATCH_CACHE:
+                self.cache.popitem(last=False)
+        return label
+
+    def categorize(self, descriptions):
+        descriptions = pd.Series(descriptions)
+        codes, uniques = pd.factorize(descriptions)
+        labels = [self.match(value) for value in uniques]
+        labels.append(UNCATEGORIZED)  # code -1 (missing description)
+        return pd.Series(labels, dtype=object).take(codes).set_axis(descriptions.index).rename("Category")
+
+    def categorize_frame(self, df, column="Description"):
+        df["Category"] = self.categorize(df[column]).values
+        return df
@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from chart_data import to_dates
+
+# Date-indexed currency conversion for the AED amounts in the statements.
+#
+# Rates come from a local CSV with columns date, currency, rate, where rate is the value
+# of 1 AED in that currency from that date on. Each currency's rates are kept sorted by
+# date, and a transaction takes the latest rate on or before its date (an as-of join
+# done with searchsorted), so converting a column is one vectorized multiply.
+# Dates before the first rate use the first rate.
+
+BASE_CURRENCY = "AED"
+RATES_FILE = os.environ.get(
+    "FX_RATES_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Files", "fx_rates.csv"),
+)
+
+# Used when no rate table is available (the app's old fixed AED -> USD rate)
+FALLBACK_RATES = pd.DataFrame({"date": ["1970-01-01"], "currency": ["USD"], "rate": [0.27]})
+
+
+class FxTable:
+
+    def __init__(self, rates):
+        rates = rates.assign(date=pd.to_datetime(rates["date"]), currency=rates["currency"].str.upper())
+        rates = rates.sort_values(["currency", "date"], kind="stable")
+        self.rates = {
+            currency: (group["date"].to_numpy(dtype="datetime64[ns]"), group["rate"].to_numpy(dtype=float))
+            for currency, group in rates.groupby("currency", sort=True)
+        }
+
+    @classmethod
+    def from_csv(cls, path=RATES_FILE):
+        if path and os.path.exists(path):
+            return cls(pd.read_csv(path))
+        return cls(FALLBACK_RATES)
+
+    def currencies(self):
+        return [BASE_CURRENCY] + [c for c in self.rates if c != BASE_CURRENCY]
+
+    def rates_for(self, dates, currency):
+        # Rate of every date in `dates` (as-of join); 1.0 for the base currency
+        dates = pd.DatetimeIndex(to_dates(pd.Series(dates))).to_numpy(dtype="datetime64[ns]")
+        if currency == BASE_CURRENCY:
+            return np.ones(len(dates))
+        days, rates = self.rates[currency]
+        at = np.searchsorted(days, dates, side="right") - 1
+        return rates[np.clip(at, 0, len(rates) - 1)]
+
+
+class LazyConverter:
+    # Converted columns for one frame and currency, computed the first time they're asked for
+
+    def __init__(self, df, table, currency):
+        self.df = df
+        self.table = table
+        self.currency = currency
+        self._rates = None
+        self._columns = {}
+        self._frames = {}
+
+    def name(self, column):
+        return f"{column} ({self.currency})"
+
+    def rates(self):
+        if self._rates is None:
+            self._rates = self.table.rates_for(self.df["Date"], self.currency)
+        return self._rates
+
+    def column(self, column):
+        if column not in self._columns:
+            values = self.df[column].to_numpy(dtype=float) * self.rates()
+            self._columns[column] = pd.Series(values, index=self.df.index, name=self.name(column))
+        return self._columns[column]
+
+    def frame(self, *columns):
+        # The original frame plus the requested converted columns
+        if columns not in self._frames:
+            self._frames[columns] = self.df.assign(**{self.name(c): self.column(c) for c in columns})
+        return self._frames[columns]
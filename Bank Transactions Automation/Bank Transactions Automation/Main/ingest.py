@@ -0,0 +1,75 @@
+import pandas as pd
+
+from amounts import AMOUNT_COLUMNS, read_statement_chunks
+from reconcile import ReconcileState
+
+# Streaming ingestion for statements too big to hold in memory.
+# The CSV is read in bounded chunks; each chunk is cleaned, categorized and folded
+# into running per-category and per-day totals, then dropped. Only when the caller
+# asks for the rows (the data_editor needs them) are the chunks kept and stitched together.
+# Per-day totals are kept per chunk and combined once, the first time per_day is read,
+# so a long file costs one regroup of its days rather than one per chunk.
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+class StatementSummary:
+
+    def __init__(self):
+        self.rows = 0
+        self.per_category = None  # Category -> Deposits, Withdrawls, Balance sums and Count
+        self._day_parts = []  # per-chunk day totals, combined by the per_day property
+        self._per_day = None
+        self.closing_balance = None
+        self.frame = None
+        self.reconciliation = ReconcileState()  # balance checks carried across chunks
+
+    def add(self, chunk):
+        self.rows += len(chunk)
+        self.reconciliation.update(chunk)
+        if len(chunk):
+            self.closing_balance = chunk["Balance"].iloc[-1]
+
+        by_category = chunk.groupby("Category")[AMOUNT_COLUMNS].sum()
+        by_category["Count"] = chunk.groupby("Category").size()
+        if self.per_category is None:
+            self.per_category = by_category
+        else:
+            self.per_category = self.per_category.add(by_category, fill_value=0).astype({"Count": "int64"})
+
+        by_day = chunk.groupby("Date", sort=False).agg(
+            Deposits=("Deposits", "sum"),
+            Withdrawls=("Withdrawls", "sum"),
+            Count=("Deposits", "size"),
+            Balance=("Balance", "last"),
+        )
+        self._day_parts.append(by_day)
+        self._per_day = None
+
+    @property
+    def per_day(self):
+        # Date -> Deposits, Withdrawls sums, Count and closing Balance
+        if self._per_day is None and self._day_parts:
+            # A day can straddle two chunks; the later chunk holds its closing balance
+            self._per_day = pd.concat(self._day_parts).groupby(level=0, sort=False).agg(
+                {"Deposits": "sum", "Withdrawls": "sum", "Count": "sum", "Balance": "last"}
+            )
+            self._day_parts = [self._per_day]
+        return self._per_day
+
+    def category_totals(self, column):
+        # Same shape as df.groupby("Category")[column].sum().reset_index()
+        return self.per_category[column].reset_index()
+
+
+def stream_transactions(file, matcher, chunksize=DEFAULT_CHUNKSIZE, keep_rows=False):
+    summary = StatementSummary()
+    kept = []
+    for chunk in read_statement_chunks(file, chunksize):
+        chunk = matcher.categorize_frame(chunk)
+        summary.add(chunk)
+        if keep_rows:
+            kept.append(chunk)
+    if keep_rows:
+        summary.frame = pd.concat(kept, ignore_index=True) if kept else pd.DataFrame()
+    return summary
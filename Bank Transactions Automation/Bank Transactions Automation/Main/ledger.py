@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from chart_data import to_dates
+
+# Combined ledger built from several, possibly overlapping, statement exports.
+#
+# Every transaction gets a 64-bit key: a hash of (Date, Description, Deposits,
+# Withdrawls, Balance) combined with an occurrence counter, so two genuinely identical
+# transactions in one export stay distinct while the copy of a row that shows up again
+# in an overlapping export collapses onto the original. Keys are kept in a sorted array
+# and new ones are looked up with searchsorted, so deduplication is hash + sort, never
+# pairwise. Rows stay in date order: only the new rows are sorted, then merged into the
+# existing ledger in one linear pass.
+
+KEY_COLUMNS = ["Date", "Description", "Deposits", "Withdrawls", "Balance"]
+
+
+def transaction_keys(df):
+    row_hash = pd.util.hash_pandas_object(df[KEY_COLUMNS], index=False).to_numpy()
+    occurrence = pd.Series(row_hash).groupby(row_hash, sort=False).cumcount().to_numpy()
+    pairs = pd.DataFrame({"hash": row_hash, "occurrence": occurrence})
+    return pd.util.hash_pandas_object(pairs, index=False).to_numpy()
+
+
+def merge_positions(old_sorted, new_sorted):
+    # Where each element of new_sorted lands when merged into old_sorted (after equal values)
+    return np.searchsorted(old_sorted, new_sorted, side="right") + np.arange(len(new_sorted))
+
+
+class Ledger:
+
+    def __init__(self):
+        self.frame = None
+        self.days = np.empty(0, dtype="datetime64[ns]")  # date of every ledger row, ascending
+        self.keys = np.empty(0, dtype=np.uint64)  # every key in the ledger, ascending
+        self.sources = []
+
+    def __len__(self):
+        return 0 if self.frame is None else len(self.frame)
+
+    def add(self, df, source=None):
+        # Merge one statement; returns (rows added, duplicates dropped)
+        keys = transaction_keys(df)
+        slot = np.searchsorted(self.keys, keys)
+        known = np.zeros(len(keys), dtype=bool)
+        inside = slot < len(self.keys)
+        known[inside] = self.keys[slot[inside]] == keys[inside]
+
+        fresh = df[~known]
+        fresh_keys = keys[~known]
+        fresh_days = to_dates(fresh["Date"]).to_numpy(dtype="datetime64[ns]")
+        order = np.argsort(fresh_days, kind="stable")
+        fresh, fresh_keys, fresh_days = fresh.iloc[order], fresh_keys[order], fresh_days[order]
+
+        key_order = np.sort(fresh_keys)
+        self.keys = np.insert(self.keys, np.searchsorted(self.keys, key_order), key_order)
+
+        if self.frame is None:
+            self.frame = fresh.reset_index(drop=True)
+            self.days = fresh_days
+        else:
+            total = len(self.frame) + len(fresh)
+            at = merge_positions(self.days, fresh_days)
+            take = np.empty(total, dtype=np.int64)
+            is_new = np.zeros(total, dtype=bool)
+            is_new[at] = True
+            take[at] = len(self.frame) + np.arange(len(fresh))
+            take[~is_new] = np.arange(len(self.frame))
+
+            combined = pd.concat([self.frame, fresh], ignore_index=True)
+            self.frame = combined.take(take).reset_index(drop=True)
+            days = np.empty(total, dtype="datetime64[ns]")
+            days[at] = fresh_days
+            days[~is_new] = self.days
+            self.days = days
+
+        if source is not None:
+            self.sources.append(source)
+        return len(fresh), int(known.sum())
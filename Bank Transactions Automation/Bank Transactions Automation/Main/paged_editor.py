@@ -0,0 +1,97 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Server-side paging and filtering for the category editor.
+#
+# st.data_editor ships every row it is given to the browser on each rerun, so the
+# editor only ever gets one page. PagedTable selects that page from a CompactLedger:
+#   - sort orders (argsort) of Date and the amount columns are computed once per
+#     statement, with the values in sorted order next to them, so a date or amount
+#     range is two binary searches and the sorted listing is a slice
+#   - the description search runs over the distinct descriptions only and is mapped
+#     back to the rows through the Categorical codes (last few terms are cached)
+#   - the category filter is a lookup on the current category codes, so edits show up
+#     without rebuilding anything
+# Page frames keep the ledger's index labels as stable row IDs; edits on a page are
+# written back by those labels (see edits.apply_category_edits).
+
+SORT_COLUMNS = ["Date", "Deposits", "Withdrawls", "Balance"]
+PAGE_SIZES = [100, 250, 500, 1000]
+SEARCH_CACHE = 16
+
+
+class PagedTable:
+
+    def __init__(self, ledger):
+        self.ledger = ledger
+        self._orders = {}  # column -> (argsort positions, values in that order)
+        self._search = OrderedDict()  # lower-cased term -> bool per distinct description
+
+    def __len__(self):
+        return len(self.ledger)
+
+    def _values(self, column):
+        return self.ledger.dates if column == "Date" else self.ledger.column(column).to_numpy()
+
+    def order(self, column):
+        if column not in self._orders:
+            values = self._values(column)
+            order = np.argsort(values, kind="stable")
+            order = order.astype(np.int32 if len(order) < 2**31 else np.int64)
+            self._orders[column] = (order, values[order])
+        return self._orders[column]
+
+    def _range(self, mask, column, low, high):
+        # Keep only rows with low <= value <= high (either bound may be None)
+        order, values = self.order(column)
+        lo = 0 if low is None else np.searchsorted(values, low, side="left")
+        hi = len(values) if high is None else np.searchsorted(values, high, side="right")
+        inside = np.zeros(len(values), dtype=bool)
+        inside[order[lo:hi]] = True
+        mask &= inside
+
+    def _search_hits(self, term):
+        term = term.lower()
+        if term in self._search:
+            self._search.move_to_end(term)
+        else:
+            uniques = pd.Series(self.ledger.description.categories, dtype=object).astype(str)
+            hits = uniques.str.lower().str.contains(term, regex=False).to_numpy(dtype=bool)
+            self._search[term] = np.append(hits, False)  # code -1 (missing description)
+            if len(self._search) > SEARCH_CACHE:
+                self._search.popitem(last=False)
+        return self._search[term][self.ledger.description.codes]
+
+    def mask(self, start=None, end=None, categories=None, amount_column=None, low=None, high=None, search=None):
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None or end is not None:
+            self._range(mask,
+                        "Date",
+                        None if start is None else np.datetime64(pd.Timestamp(start), "ns"),
+                        None if end is None else np.datetime64(pd.Timestamp(end) + pd.Timedelta(days=1), "ns") - 1)
+        if amount_column and (low is not None or high is not None):
+            self._range(mask, amount_column, low, high)
+        if categories:
+            category = self.ledger.category
+            allowed = np.append(np.isin(category.categories, list(categories)), False)
+            mask &= allowed[category.codes]
+        if search:
+            mask &= self._search_hits(search)
+        return mask
+
+    def select(self, sort="Date", descending=False, **filters):
+        # Row positions passing the filters, in display order
+        order, _ = self.order(sort)
+        positions = order[self.mask(**filters)[order]]
+        return positions[::-1] if descending else positions
+
+    def page(self, positions, number, size, columns):
+        # One page of rows, indexed by their stable row IDs
+        rows = positions[number * size:(number + 1) * size]
+        return pd.DataFrame({name: self.ledger.column(name).iloc[rows] for name in columns})
+
+    def nbytes(self):
+        return int(sum(order.nbytes + values.nbytes for order, values in self._orders.values())
+                   + sum(hits.nbytes for hits in self._search.values()))
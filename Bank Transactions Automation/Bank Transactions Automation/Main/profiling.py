@@ -0,0 +1,161 @@
+import cProfile
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Opt-in stage timing for the dashboard.
+#
+# Each rerun is one "run"; code inside it marks its stages with
+#     with profiler.stage("parse") as rec:
+#         df = ...
+#         rec.rows = len(df)
+# and every stage records its wall time, the rows it handled and the change in traced
+# Python memory. The last HISTORY runs are kept so a slow stage stands out against the
+# previous reruns. With profile_dir set, the whole rerun also runs under cProfile and
+# is dumped to a .pstats file (open with `python -m pstats` or snakeviz).
+# Disabled, stage() is a bare context manager and nothing is measured.
+#
+# tracemalloc and cProfile are process-wide while every browser session has its own
+# Profiler, so the sharing is done here at module level: tracing is reference counted
+# (started by the first profiling session, stopped by the last) and the peak is only
+# reset when no other session is mid-run, so while sessions overlap a run's peak covers
+# all of them. Only one session at a time captures a cProfile dump; the others run
+# without one until it is free.
+
+HISTORY = 20
+PROFILE_DIR = os.environ.get("BANK_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "bank_profiles"))
+
+_TRACE_LOCK = threading.Lock()
+_tracers = 0
+_started_tracing = False  # tracemalloc was started here rather than by the host process
+_PROFILE_LOCK = threading.Lock()
+
+
+def _acquire_tracing():
+    global _tracers, _started_tracing
+    with _TRACE_LOCK:
+        if _tracers == 0:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _started_tracing = True
+            tracemalloc.reset_peak()
+        _tracers += 1
+
+
+def _release_tracing():
+    # Returns the traced peak seen by this run
+    global _tracers, _started_tracing
+    with _TRACE_LOCK:
+        peak = tracemalloc.get_traced_memory()[1]
+        _tracers -= 1
+        if _tracers == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+        return peak
+
+
+class StageRecord:
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self.seconds = 0.0
+        self.memory = 0  # bytes allocated and still held at the end of the stage
+
+
+class Run:
+
+    def __init__(self, number):
+        self.number = number
+        self.started = time.time()
+        self.seconds = 0.0
+        self.peak = None
+        self.stages = []
+        self.profile_file = None
+
+    def frame(self):
+        return pd.DataFrame({
+            "Stage": [s.name for s in self.stages],
+            "ms": [s.seconds * 1000 for s in self.stages],
+            "Rows": pd.array([s.rows for s in self.stages], dtype="Int64"),
+            "Δ MB": [s.memory / 1e6 for s in self.stages],
+        })
+
+
+class Profiler:
+
+    def __init__(self, history=HISTORY):
+        self.enabled = False
+        self.profile_dir = None
+        self.history = deque(maxlen=history)
+        self.current = None
+        self.runs = 0
+        self._profile = None
+
+    def start_run(self, enabled, profile_dir=None):
+        self.enabled = enabled
+        self.profile_dir = profile_dir if enabled else None
+        if self.current is not None:
+            self.finish_run()  # the previous rerun never finished; give back what it holds
+        if not enabled:
+            return
+        self.runs += 1
+        self.current = Run(self.runs)
+        self._start = time.perf_counter()
+        _acquire_tracing()
+        if self.profile_dir and _PROFILE_LOCK.acquire(blocking=False):
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def finish_run(self):
+        run = self.current
+        if run is None:
+            return None
+        self.current = None
+        if self._profile is not None:
+            self._profile.disable()
+        run.seconds = time.perf_counter() - self._start
+        run.peak = _release_tracing()
+        self.history.append(run)
+        if self._profile is not None:
+            try:
+                os.makedirs(self.profile_dir, exist_ok=True)
+                run.profile_file = os.path.join(self.profile_dir, f"run-{int(run.started)}-{run.number}.pstats")
+                self._profile.dump_stats(run.profile_file)
+            finally:
+                self._profile = None
+                _PROFILE_LOCK.release()
+        return run
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        record = StageRecord(name, rows)
+        if self.current is None:
+            yield record
+            return
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            record.memory = tracemalloc.get_traced_memory()[0] - before
+            self.current.stages.append(record)
+
+    def last_run(self):
+        return self.history[-1] if self.history else None
+
+    def history_frame(self):
+        # Milliseconds per stage (columns) for each recent run (rows); repeated stages are summed
+        rows = {}
+        for run in self.history:
+            totals = rows.setdefault(run.number, {})
+            for s in run.stages:
+                totals[s.name] = totals.get(s.name, 0.0) + s.seconds * 1000
+        return pd.DataFrame.from_dict(rows, orient="index").rename_axis("Run").fillna(0.0)
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+from chart_data import to_dates
+from ledger import KEY_COLUMNS
+
+# Running-balance reconciliation for statements.
+#
+# Every Balance should equal the previous Balance + Deposits - Withdrawls. Amounts are
+# converted to integer cents so the running sums are exact, then
+#   drift      = Balance - (opening balance + cumulative sum of Deposits - Withdrawls)
+# is the accumulated error at each row, and a row is a balance break wherever the drift
+# changes by more than the tolerance. Rows that repeat an earlier row exactly are flagged
+# as duplicates and rows dated before their predecessor as out of order.
+# Everything is numpy over whole columns; ReconcileState carries the last balance,
+# last date and the row hashes of the latest DUPLICATE_WINDOW_DAYS from one chunk to the
+# next in streaming mode. Duplicated exports repeat a row on or next to its own date, so
+# comparing against that window finds them while the state stays bounded by the busiest
+# few days rather than growing with the file.
+
+TOLERANCE_CENTS = 0
+FLAGS = ["Balance Break", "Duplicate", "Out of Order"]
+MAX_KEPT_ROWS = 1000
+DUPLICATE_WINDOW_DAYS = 3
+
+
+def to_cents(values):
+    return np.round(np.nan_to_num(values.to_numpy(dtype=float)) * 100).astype(np.int64)
+
+
+class ReconcileState:
+
+    def __init__(self, tolerance_cents=TOLERANCE_CENTS):
+        self.tolerance = tolerance_cents
+        self.balance = None  # last balance seen, in cents
+        self.date = None
+        self.drift = 0
+        self.hashes = np.empty(0, dtype=np.uint64)  # hashes of the rows in the duplicate window
+        self.hash_dates = np.empty(0, dtype="datetime64[ns]")
+        self.rows = 0
+        self.counts = dict.fromkeys(FLAGS, 0)
+        self.flagged = []  # first MAX_KEPT_ROWS flagged rows, for display
+
+    def update(self, df):
+        # Flags for one chunk (a DataFrame of bools aligned with df) plus the cumulative drift
+        balance = to_cents(df["Balance"])
+        net = to_cents(df["Deposits"]) - to_cents(df["Withdrawls"])
+
+        if self.balance is None and len(df):
+            self.balance = balance[0] - net[0]  # take the first row's opening balance as given
+        opening = self.balance if self.balance is not None else 0
+        running = opening + np.cumsum(net)
+        drift = balance - running + self.drift
+        step = np.diff(drift, prepend=self.drift)
+        breaks = np.abs(step) > self.tolerance
+
+        dates = to_dates(df["Date"]).to_numpy(dtype="datetime64[ns]")
+        # Each row's predecessor; the first row of a chunk compares with the last row of the previous one
+        first = dates[:1] if self.date is None else np.asarray([self.date], dtype=dates.dtype)
+        previous_dates = np.concatenate([first, dates[:-1]])[:len(dates)]
+        out_of_order = dates < previous_dates
+
+        duplicate = self._duplicates(df, dates)
+
+        flags = pd.DataFrame({"Balance Break": breaks, "Duplicate": duplicate, "Out of Order": out_of_order},
+                             index=df.index)
+        drift_series = pd.Series(drift / 100, index=df.index, name="Drift")
+
+        if len(df):
+            self.balance = balance[-1]
+            self.date = dates[-1]
+            self.drift = drift[-1]
+        self.rows += len(df)
+        for flag in FLAGS:
+            self.counts[flag] += int(flags[flag].sum())
+        room = MAX_KEPT_ROWS - sum(len(part) for part in self.flagged)
+        if room > 0:
+            hit = flags.any(axis=1)
+            if hit.any():
+                self.flagged.append(df[hit].join(flags[hit]).head(room))
+        return flags, drift_series
+
+    def _duplicates(self, df, dates):
+        hashes = pd.util.hash_pandas_object(df[KEY_COLUMNS], index=False).to_numpy()
+        within = pd.Series(hashes).duplicated().to_numpy()
+        earlier = np.isin(hashes, self.hashes)
+
+        # Carry over only the rows dated within the window of the latest date seen
+        new = ~(within | earlier)
+        hashes = np.concatenate([self.hashes, hashes[new]])
+        hash_dates = np.concatenate([self.hash_dates, dates[new]])
+        if len(hash_dates) and not np.isnat(hash_dates).all():
+            cutoff = np.nanmax(hash_dates) - np.timedelta64(DUPLICATE_WINDOW_DAYS, "D")
+            recent = hash_dates >= cutoff
+            hashes, hash_dates = hashes[recent], hash_dates[recent]
+        self.hashes, self.hash_dates = hashes, hash_dates
+        return within | earlier
+
+    def summary(self):
+        return {"rows": self.rows, **self.counts, "drift": float(self.drift) / 100}
+
+    def flagged_rows(self):
+        return pd.concat(self.flagged) if self.flagged else pd.DataFrame()
+
+
+def reconcile(df, tolerance_cents=TOLERANCE_CENTS):
+    # One-shot reconciliation of a whole statement: (flags, drift, summary dict)
+    state = ReconcileState(tolerance_cents)
+    flags, drift = state.update(df)
+    return flags, drift, state.summary()
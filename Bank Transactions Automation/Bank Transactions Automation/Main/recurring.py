@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+from chart_data import to_dates
+
+# Recurring payment / subscription detection.
+#
+# Transactions are grouped by normalized description (lower case, digits and
+# punctuation dropped, so "NETFLIX.COM 4821" and "Netflix.com 0193" agree), direction
+# and an amount band (amounts within AMOUNT_BAND of each other on a log scale).
+# One lexsort orders the rows by (group, date); the gaps between consecutive rows of
+# the same group are then matched against each period in PERIODS, and bincount tallies
+# the hits per group. A group is recurring when enough of its gaps fit one period.
+# Only the detected series (a few hundred at most) are handled one by one afterwards.
+
+# (name, days, tolerance in days)
+PERIODS = [("Weekly", 7, 1), ("Monthly", 30.44, 3), ("Yearly", 365.25, 7)]
+AMOUNT_BAND = 0.1
+MIN_OCCURRENCES = 3
+MIN_SHARE = 0.7
+HORIZON_DAYS = 90
+
+
+def normalize_descriptions(descriptions):
+    text = pd.Series(descriptions, dtype=object).astype(str).str.lower()
+    return text.str.replace(r"[^a-z]+", " ", regex=True).str.strip()
+
+
+def detect_recurring(df, band=AMOUNT_BAND, min_occurrences=MIN_OCCURRENCES, min_share=MIN_SHARE):
+    # One row per recurring series; "Row" is the index label of its latest transaction
+    dates = to_dates(df["Date"]).to_numpy(dtype="datetime64[D]")
+    amounts = (np.nan_to_num(df["Deposits"].to_numpy(dtype=float))
+               - np.nan_to_num(df["Withdrawls"].to_numpy(dtype=float)))
+    rows = np.flatnonzero(~np.isnat(dates) & (amounts != 0))
+
+    raw_codes, raw = pd.factorize(df["Description"].to_numpy()[rows])
+    name_codes, _ = pd.factorize(normalize_descriptions(raw))
+    names = name_codes[raw_codes] if len(raw) else raw_codes
+
+    amount = amounts[rows]
+    level = np.floor(np.log(np.abs(amount)) / np.log1p(band)).astype(np.int64)
+    level -= level.min() if len(level) else 0
+    key = (names * 2 + (amount > 0)) * (level.max() + 1 if len(level) else 1) + level
+    groups, _ = pd.factorize(key)
+
+    days = dates[rows].astype(np.int64)
+    order = np.lexsort((days, groups))
+    g, d, a = groups[order], days[order], amount[order]
+    n_groups = g.max() + 1 if len(g) else 0
+
+    # Gaps between consecutive transactions of the same group (same-day repeats ignored)
+    gap = np.diff(d)
+    valid = (g[1:] == g[:-1]) & (gap > 0)
+    period = np.full(len(gap), -1)
+    for i, (_, length, tolerance) in enumerate(PERIODS):
+        period[valid & (np.abs(gap - length) <= tolerance)] = i
+    gap_group = g[1:]
+    intervals = np.bincount(gap_group[valid], minlength=n_groups)
+    hit = period >= 0
+    hits = np.bincount(gap_group[hit] * len(PERIODS) + period[hit],
+                       minlength=n_groups * len(PERIODS)).reshape(n_groups, len(PERIODS))
+    best = hits.argmax(axis=1)
+    best_hits = hits.max(axis=1) if n_groups else np.zeros(0, dtype=np.int64)
+    recurring = (best_hits >= min_occurrences - 1) & (best_hits >= min_share * np.maximum(intervals, 1))
+
+    starts = np.flatnonzero(np.r_[True, g[1:] != g[:-1]]) if len(g) else np.zeros(0, dtype=np.int64)
+    ends = np.r_[starts[1:], len(g)] - 1
+    keep = recurring[g[starts]]
+    starts, ends = starts[keep], ends[keep]
+    group = g[starts]
+    count = ends - starts + 1
+    mean_amount = np.bincount(g, weights=a, minlength=n_groups)[group] / count
+
+    period_names = np.array([name for name, _, _ in PERIODS], dtype=object)
+    period_days = np.array([length for _, length, _ in PERIODS])[best[group]]
+    first = d[starts].astype("datetime64[D]")
+    last = d[ends].astype("datetime64[D]")
+    interval = np.where(count > 1, (d[ends] - d[starts]) / np.maximum(count - 1, 1), period_days)
+    latest = rows[order[ends]]
+    end_of_data = dates[rows].max() if len(rows) else None
+
+    result = pd.DataFrame({
+        "Description": np.asarray(df["Description"].to_numpy()[latest], dtype=object),
+        "Period": period_names[best[group]],
+        "Amount": mean_amount.round(2),
+        "Occurrences": count,
+        "First": pd.to_datetime(first),
+        "Last": pd.to_datetime(last),
+        "Next": pd.to_datetime(last) + pd.to_timedelta(np.round(interval), unit="D"),
+        "Interval": interval,
+        "Active": (end_of_data - last).astype(np.int64) <= 1.5 * interval + 7 if len(last) else np.zeros(0, dtype=bool),
+        "Annual": (mean_amount * 365.25 / period_days).round(2),
+        "Row": df.index[latest],
+    })
+    return result.sort_values("Annual", key=np.abs, ascending=False).reset_index(drop=True)
+
+
+def upcoming(recurring, start=None, horizon_days=HORIZON_DAYS):
+    # Projected transactions of the active series from `start` (default: today) for the next horizon_days
+    series = recurring[recurring["Active"]]
+    start = pd.Timestamp(start) if start is not None else pd.Timestamp.today().normalize()
+    end = start + pd.Timedelta(days=horizon_days)
+    step = pd.to_timedelta(np.round(series["Interval"].to_numpy()), unit="D").to_numpy()
+
+    # Skip the periods that fall before `start`, then count the ones up to `end`
+    nxt = series["Next"].to_numpy()
+    behind = np.maximum(np.ceil((start.to_datetime64() - nxt) / step), 0)
+    first = nxt + behind * step
+    count = np.maximum(np.floor((end.to_datetime64() - first) / step) + 1, 0).astype(np.int64)
+
+    repeat = np.repeat(np.arange(len(series)), count)
+    offset = np.arange(len(repeat)) - np.repeat(np.cumsum(count) - count, count)
+    projected = pd.DataFrame({
+        "Date": first[repeat] + offset * step[repeat],
+        "Description": series["Description"].to_numpy()[repeat],
+        "Amount": series["Amount"].to_numpy()[repeat],
+        "Period": series["Period"].to_numpy()[repeat],
+        "Row": series["Row"].to_numpy()[repeat],
+    })
+    return projected.sort_values("Date", kind="stable").reset_index(drop=True)
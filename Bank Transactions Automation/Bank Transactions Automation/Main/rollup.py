@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+from chart_data import to_dates
+
+# Date x category rollup for the bank dashboard.
+#
+# Built once per loaded statement: a (day, category) grid of Deposits, Withdrawls and
+# Balance sums plus transaction counts, and the closing balance of every day.
+# Summaries, pie charts, metrics and month/year views read from the grid, so their
+# cost depends on days x categories, not on the number of transactions.
+# When rows are recategorized, sync() moves just those rows between cells.
+# The closing balance is kept per day only: it belongs to the account, not to a
+# category, so recategorizing never changes it.
+
+MEASURES = ["Deposits", "Withdrawls", "Balance"]
+
+
+class RollupCube:
+
+    def __init__(self, df):
+        dates = to_dates(df["Date"])
+        day_codes, days = pd.factorize(dates, sort=True)
+        cat_codes, categories = pd.factorize(df["Category"])
+
+        self.days = pd.DatetimeIndex(days)
+        self.categories = list(categories)
+        self.category_codes = {c: i for i, c in enumerate(self.categories)}
+
+        # Per-row inputs, kept so recategorized rows can be moved between cells.
+        # Rows without a readable date (code -1) are left out of the grid.
+        self.valid = day_codes >= 0
+        self.day_codes = day_codes
+        self.cat_codes = cat_codes.astype(np.int64)
+        self.values = {m: df[m].to_numpy(dtype=float) for m in MEASURES}
+
+        shape = (len(self.days), len(self.categories))
+        self.cells = {m: np.zeros(shape) for m in MEASURES}
+        self.counts = np.zeros(shape, dtype=np.int64)
+        self._add(np.flatnonzero(self.valid), 1)
+
+        balance = pd.Series(self.values["Balance"][self.valid])
+        self.closing = balance.groupby(day_codes[self.valid]).last().reindex(range(len(self.days))).to_numpy()
+
+    def _add(self, rows, sign):
+        if not len(rows):
+            return
+        n_days, n_cats = self.counts.shape
+        flat = self.day_codes[rows] * n_cats + self.cat_codes[rows]
+        size = n_days * n_cats
+        for m in MEASURES:
+            self.cells[m] += sign * np.bincount(flat, weights=self.values[m][rows], minlength=size).reshape(n_days, n_cats)
+        self.counts += sign * np.bincount(flat, minlength=size).reshape(n_days, n_cats)
+
+    def _category_code(self, category):
+        if category not in self.category_codes:
+            self.category_codes[category] = len(self.categories)
+            self.categories.append(category)
+            for m in MEASURES:
+                self.cells[m] = np.hstack([self.cells[m], np.zeros((len(self.days), 1))])
+            self.counts = np.hstack([self.counts, np.zeros((len(self.days), 1), dtype=np.int64)])
+        return self.category_codes[category]
+
+    def sync(self, categories):
+        # Bring the cube in line with a Category column; returns how many rows moved
+        labels = np.asarray(categories, dtype=object)
+        current = np.asarray(self.categories, dtype=object)[self.cat_codes]
+        changed = np.flatnonzero(labels != current)
+        if not len(changed):
+            return 0
+
+        new_codes = np.array([self._category_code(c) for c in labels[changed]], dtype=np.int64)
+        moved = changed[self.valid[changed]]
+        self._add(moved, -1)
+        self.cat_codes[changed] = new_codes
+        self._add(moved, 1)
+        return len(changed)
+
+    def _grid(self, measure, day_weights=None):
+        # day_weights scales each day's row, e.g. that day's exchange rate
+        grid = self.counts if measure == "Count" else self.cells[measure]
+        if day_weights is not None:
+            grid = grid * np.asarray(day_weights, dtype=float)[:, None]
+        return grid
+
+    def category_totals(self, measure, day_weights=None):
+        # Same shape as df.groupby("Category")[measure].sum().reset_index()
+        grid = self._grid(measure, day_weights)
+        totals = pd.DataFrame({"Category": self.categories, measure: grid.sum(axis=0)})
+        return totals[self.counts.sum(axis=0) > 0].reset_index(drop=True)
+
+    def total(self, measure, day_weights=None):
+        return self._grid(measure, day_weights).sum()
+
+    def per_day(self, measure):
+        # Flows are summed over categories; "Balance" is the day's closing balance
+        if measure == "Balance":
+            values = self.closing
+        elif measure == "Count":
+            values = self.counts.sum(axis=1)
+        else:
+            values = self.cells[measure].sum(axis=1)
+        return pd.DataFrame({"Date": self.days, measure: values})
+
+    def by_period(self, measure, freq="M", by_category=False):
+        # Month ("M") / year ("Y") views built from the daily grid
+        periods = self.days.to_period(freq).start_time
+        if by_category:
+            grid = self.counts if measure == "Count" else self.cells[measure]
+            frame = pd.DataFrame(grid, index=periods, columns=self.categories)
+            return frame.groupby(level=0).sum().rename_axis("Date")
+        daily = self.per_day(measure).set_index("Date")[measure]
+        how = "last" if measure == "Balance" else "sum"
+        return daily.groupby(periods).agg(how).rename_axis("Date").reset_index()
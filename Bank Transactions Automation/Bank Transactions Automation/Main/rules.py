@@ -0,0 +1,72 @@
+import os
+import threading
+
+from categorizer import CategoryMatcher
+from category_store import CategoryStore
+from fuzzy import FuzzyMatcher
+from transaction_cache import rules_version
+
+# Process-wide registry of the categorization rules.
+#
+# One RuleRegistry per server process owns the CategoryStore for the configured file
+# (BANK_CATEGORIES_FILE, default categories.json next to this module). current() stats
+# the file and its journal and returns the same RuleSet until one of them changes, or
+# until an edit is recorded through the registry; only then is a new snapshot taken and
+# its version hashed. Matchers are compiled lazily per RuleSet and mode and shared by
+# every session, so a rerun costs a couple of stat calls whatever the size of the rules.
+# The registry also stands in for the store (add_keyword / add_category / flush), taking
+# a lock so sessions on different threads don't interleave their writes.
+
+CATEGORY_FILE = os.environ.get(
+    "BANK_CATEGORIES_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "categories.json"),
+)
+
+
+class RuleSet:
+
+    def __init__(self, categories):
+        self.categories = {category: list(keywords or []) for category, keywords in categories.items()}
+        self.version = rules_version(self.categories)
+        self._matchers = {}
+        self._lock = threading.Lock()
+
+    def matcher(self, mode="exact", priority=None):
+        # mode: "exact", "substring" or "fuzzy"
+        key = (mode, tuple(priority or ()))
+        with self._lock:
+            if key not in self._matchers:
+                if mode == "fuzzy":
+                    self._matchers[key] = FuzzyMatcher(self.categories, priority=priority)
+                else:
+                    self._matchers[key] = CategoryMatcher(self.categories, mode=mode, priority=priority)
+            return self._matchers[key]
+
+
+class RuleRegistry:
+
+    def __init__(self, path=CATEGORY_FILE):
+        self.store = CategoryStore(path)
+        self.lock = threading.RLock()
+        self._rules = None
+        self._changes = None
+
+    def current(self):
+        with self.lock:
+            self.store.load()
+            if self.store.changes != self._changes:
+                self._rules = RuleSet(self.store.categories)
+                self._changes = self.store.changes
+            return self._rules
+
+    def add_category(self, category):
+        with self.lock:
+            return self.store.add_category(category)
+
+    def add_keyword(self, category, keyword):
+        with self.lock:
+            return self.store.add_keyword(category, keyword)
+
+    def flush(self):
+        with self.lock:
+            return self.store.flush()
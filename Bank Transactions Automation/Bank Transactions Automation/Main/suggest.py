@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from categorizer import UNCATEGORIZED
+from fuzzy import trigrams
+
+# Category suggestions for rows keyword matching left "Uncategorized".
+#
+# A multinomial naive Bayes model is trained on the rows that already have a category.
+# Descriptions are turned into a sparse (CSR) matrix of word-padded character trigrams,
+# so "AMAZON AE 4431" and "AMAZON AE 9902" share almost every feature. Training and
+# scoring both work on distinct descriptions (weighted by how often they occur), and all
+# of them are scored at once: per-class log-probabilities are gathered for every nonzero
+# of the matrix and summed per row with a cumulative sum, which is the sparse matrix
+# product without a Python loop per row.
+
+
+def sparse_features(texts, vocabulary, grow=False):
+    # CSR (indptr, indices) of binary trigram features; unseen trigrams are dropped unless grow
+    indptr = [0]
+    indices = []
+    for text in texts:
+        for gram in trigrams(text):
+            column = vocabulary.get(gram)
+            if column is None and grow:
+                column = vocabulary[gram] = len(vocabulary)
+            if column is not None:
+                indices.append(column)
+        indptr.append(len(indices))
+    return np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64)
+
+
+class SuggestionModel:
+
+    def __init__(self, alpha=1.0):
+        self.alpha = alpha
+        self.vocabulary = {}
+        self.classes = []
+        self.log_prior = None
+        self.log_prob = None  # classes x vocabulary
+
+    def fit(self, descriptions, categories):
+        labelled = pd.DataFrame({"Description": descriptions, "Category": categories})
+        labelled = labelled[labelled["Category"].notna() & (labelled["Category"] != UNCATEGORIZED)]
+        pairs = labelled.groupby(["Description", "Category"], sort=False).size().reset_index(name="Count")
+        if pairs.empty:
+            return self
+
+        class_ids, classes = pd.factorize(pairs["Category"])
+        self.classes = list(classes)
+        weights = pairs["Count"].to_numpy(dtype=float)
+
+        indptr, indices = sparse_features(pairs["Description"], self.vocabulary, grow=True)
+        rows = np.repeat(np.arange(len(pairs)), np.diff(indptr))
+        n_classes, n_features = len(self.classes), len(self.vocabulary)
+        counts = np.bincount(class_ids[rows] * n_features + indices, weights=weights[rows],
+                             minlength=n_classes * n_features).reshape(n_classes, n_features)
+
+        smoothed = counts + self.alpha
+        self.log_prob = np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))
+        prior = np.bincount(class_ids, weights=weights, minlength=n_classes)
+        self.log_prior = np.log(prior) - np.log(prior.sum())
+        return self
+
+    def predict(self, descriptions):
+        # (suggested category, confidence) for every description, as two Series
+        descriptions = pd.Series(descriptions)
+        if not self.classes:
+            empty = pd.Series([None] * len(descriptions), index=descriptions.index, dtype=object)
+            return empty, pd.Series(0.0, index=descriptions.index)
+
+        codes, uniques = pd.factorize(descriptions)
+        indptr, indices = sparse_features(uniques, self.vocabulary)
+
+        gathered = self.log_prob[:, indices]
+        running = np.concatenate([np.zeros((len(self.classes), 1)), np.cumsum(gathered, axis=1)], axis=1)
+        scores = (running[:, indptr[1:]] - running[:, indptr[:-1]]).T + self.log_prior
+
+        scores -= scores.max(axis=1, keepdims=True)
+        probs = np.exp(scores)
+        probs /= probs.sum(axis=1, keepdims=True)
+        best = probs.argmax(axis=1)
+
+        labels = np.append(np.asarray(self.classes, dtype=object)[best], None)  # code -1 -> missing
+        confidence = np.append(probs[np.arange(len(best)), best], 0.0)
+        return (pd.Series(labels.take(codes), index=descriptions.index, name="Suggested"),
+                pd.Series(confidence.take(codes), index=descriptions.index, name="Confidence"))
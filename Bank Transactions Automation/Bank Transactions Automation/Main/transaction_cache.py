@@ -0,0 +1,223 @@
+import glob
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from description_index import DescriptionIndex, changed_keywords
+
+# Cache of parsed statements so Streamlit reruns don't re-read and re-categorize the upload.
+#
+# Entries are keyed by a sha256 of the uploaded bytes. Each entry holds the parsed,
+# typed frame in columnar form (one numpy array per column; text columns stored as
+# int32 codes + their distinct values) and, separately, the Category column for each
+# version of the rules. Editing categories.json only recomputes the Category column;
+# the parse is reused, and when a matcher is supplied and only a few keywords changed,
+# just the rows matching those keywords are relabelled through a DescriptionIndex.
+# The frame handed out for the newest rules version is kept, so a rerun that hits the
+# cache returns it (as a shallow, copy-on-write copy) without rebuilding it from codes;
+# callers that already hashed the upload pass that `key` so it isn't hashed again.
+# Entries live in memory with LRU eviction and, when a cache directory is given
+# (BANK_CACHE_DIR for the apps), are also written to disk: the parsed columns once, as
+# "<key>.npz", and each rules version's Category codes in its own "<key>@<version>.npz",
+# so a keyword change writes only the new labels.
+
+MAX_RULE_VERSIONS = 2
+MAX_INCREMENTAL_KEYWORDS = 1000
+CACHE_DIR = os.environ.get("BANK_CACHE_DIR")
+
+
+def file_key(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def rules_version(categories):
+    # Category order is part of the rules (it decides shared keywords), so it is hashed as given
+    payload = json.dumps(categories, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def to_columns(df):
+    # DataFrame -> {name: array}; text columns become codes + uniques
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+            columns[col] = series.to_numpy()
+        else:
+            codes, uniques = pd.factorize(series)
+            columns[col + "::codes"] = codes.astype(np.int32)
+            columns[col + "::uniques"] = np.asarray(uniques, dtype=str)
+    return columns
+
+
+def from_columns(columns, order):
+    data = {}
+    for col in order:
+        if col in columns:
+            data[col] = columns[col]
+        else:
+            codes = columns[col + "::codes"]
+            uniques = np.append(columns[col + "::uniques"].astype(object), None)  # code -1 -> missing
+            data[col] = uniques.take(codes)
+    return pd.DataFrame(data)
+
+
+class CachedStatement:
+
+    def __init__(self, columns, order):
+        self.columns = columns
+        self.order = order
+        self.categories = OrderedDict()  # rules version -> (codes, uniques)
+        self.rules = {}  # rules version -> snapshot of the categories it was built from
+        self.index = None
+        if "Description::codes" in columns:
+            self.index = DescriptionIndex(columns["Description::codes"], columns["Description::uniques"])
+        self.built = None  # (rules version, frame) of the last frame() call
+
+    def labels(self, version):
+        codes, uniques = self.categories[version]
+        return uniques.astype(object).take(codes)
+
+    def frame(self, version):
+        if self.built is None:
+            df = from_columns(self.columns, self.order)
+        elif self.built[0] != version:
+            df = self.built[1].copy(deep=False)  # the parsed columns are the same for every version
+        else:
+            return self.built[1].copy(deep=False)
+        df["Category"] = self.labels(version)
+        self.built = (version, df)
+        return df.copy(deep=False)
+
+    def nbytes(self):
+        arrays = list(self.columns.values()) + [a for pair in self.categories.values() for a in pair]
+        # Text cells point at the same label objects, so the shallow size is what the frame adds
+        built = int(self.built[1].memory_usage().sum()) if self.built is not None else 0
+        return sum(a.nbytes for a in arrays) + built
+
+
+class TransactionCache:
+
+    def __init__(self, max_entries=8, cache_dir=None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.entries = OrderedDict()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def load(self, data, categories, parse, categorize, matcher=None, version=None, key=None):
+        # parse(bytes) -> typed DataFrame without Category
+        # categorize(DataFrame) -> DataFrame with a Category column
+        # matcher: CategoryMatcher for `categories`, enables incremental relabelling
+        # version: rules_version(categories) when the caller already has it
+        # key: file_key(data) when the caller already has it
+        key = key or file_key(data)
+        mode = getattr(matcher, "mode", "")
+        version = f"{mode}:{version or rules_version(categories)}"
+
+        entry = self._get(key)
+        if entry is None:
+            df = parse(data)
+            if df is None:
+                return None
+            entry = CachedStatement(to_columns(df), list(df.columns))
+            self._put(key, entry)
+            self._write_columns(key, entry)
+
+        if version not in entry.categories:
+            patched = self._retag(entry, categories, matcher)
+            if patched is None:
+                labels = categorize(from_columns(entry.columns, entry.order))["Category"]
+                codes, uniques = pd.factorize(labels)
+                patched = (codes.astype(np.int32), np.asarray(uniques, dtype=str))
+            entry.categories[version] = patched
+            entry.rules[version] = json.loads(json.dumps(categories))
+            dropped = []
+            while len(entry.categories) > MAX_RULE_VERSIONS:
+                version_dropped, _ = entry.categories.popitem(last=False)
+                entry.rules.pop(version_dropped, None)
+                dropped.append(version_dropped)
+            self._write_labels(key, entry, version, dropped)
+        else:
+            entry.categories.move_to_end(version)
+
+        return entry.frame(version)
+
+    def nbytes(self):
+        return sum(entry.nbytes() for entry in self.entries.values())
+
+    def _retag(self, entry, categories, matcher):
+        # Start from the newest label codes we have and patch only rows hit by changed keywords
+        if matcher is None or entry.index is None or not entry.categories:
+            return None
+        previous = next(reversed(entry.categories))
+        if previous not in entry.rules or not previous.startswith(matcher.mode + ":"):
+            return None
+        keywords = changed_keywords(entry.rules[previous], categories)
+        if keywords is None or len(keywords) > MAX_INCREMENTAL_KEYWORDS:
+            return None
+        codes, uniques = entry.categories[previous]
+        codes, labels = codes.copy(), list(uniques)
+        entry.index.retag(codes, labels, keywords, matcher)
+        return codes, np.asarray(labels, dtype=str)
+
+    def _get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        entry = self._read(key)
+        if entry is not None:
+            self._put(key, entry)
+        return entry
+
+    def _put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _path(self, key, version=None):
+        if version is None:
+            return os.path.join(self.cache_dir, key + ".npz")
+        return os.path.join(self.cache_dir, f"{key}@{version.replace(':', '-')}.npz")
+
+    def _save(self, path, arrays):
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+
+    def _write_columns(self, key, entry):
+        # The parse never changes for a given upload, so it is written once
+        if not self.cache_dir or os.path.exists(self._path(key)):
+            return
+        self._save(self._path(key), {**entry.columns, "__order__": np.asarray(entry.order, dtype=str)})
+
+    def _write_labels(self, key, entry, version, dropped=()):
+        if not self.cache_dir:
+            return
+        codes, uniques = entry.categories[version]
+        self._save(self._path(key, version),
+                   {"codes": codes, "uniques": uniques, "__version__": np.asarray(version)})
+        for old in dropped:
+            if os.path.exists(self._path(key, old)):
+                os.remove(self._path(key, old))
+
+    def _read(self, key):
+        if not self.cache_dir or not os.path.exists(self._path(key)):
+            return None
+        with np.load(self._path(key), allow_pickle=False) as stored:
+            # Older single-file entries also hold Category@ arrays; their labels are simply recomputed
+            columns = {name: stored[name] for name in stored.files if not name.startswith("Category@")}
+        entry = CachedStatement(columns, list(columns.pop("__order__")))
+
+        # Newest label files last, the same order entry.categories keeps in memory
+        labels = sorted(glob.glob(glob.escape(os.path.join(self.cache_dir, key + "@")) + "*.npz"),
+                        key=os.path.getmtime)
+        for path in labels[-MAX_RULE_VERSIONS:]:
+            with np.load(path, allow_pickle=False) as stored:
+                entry.categories[str(stored["__version__"])] = (stored["codes"], stored["uniques"])
+        return entry
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+# Employees per age, built once when the data is loaded.
+#
+# The distinct ages are kept sorted with their counts and the running (prefix) sum of
+# those counts, so "everyone aged <= x" is a binary search plus a slice: the age slider
+# never goes back to the employee table, however many rows it has.
+
+FIGURE_CACHE = 128  # age-slider figures kept by the dashboards' LRU memo
+
+
+class AgeHistogram:
+
+    def __init__(self, ages):
+        values = pd.to_numeric(pd.Series(ages), errors="coerce").dropna().to_numpy()
+        self.ages, self.counts = np.unique(values, return_counts=True)
+        self.cumulative = np.cumsum(self.counts)
+
+    def _end(self, age):
+        return int(np.searchsorted(self.ages, age, side="right"))
+
+    def up_to(self, age):
+        # Same rows as data[data["Age"] <= age].groupby("Age").size().reset_index(name="Team Size")
+        end = self._end(age)
+        return pd.DataFrame({"Age": self.ages[:end], "Team Size": self.counts[:end]})
+
+    def total_up_to(self, age):
+        end = self._end(age)
+        return int(self.cumulative[end - 1]) if end else 0
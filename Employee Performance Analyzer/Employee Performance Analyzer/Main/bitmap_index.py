@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+# Bitmap index for cross-filtering the employee dashboard.
+#
+# Every filter value gets a bitmap of the employees it matches, packed 8 rows per byte
+# (np.packbits), built once at startup:
+#   - text / categorical columns: one bitmap per distinct value
+#   - numeric columns with at most MAX_DISTINCT values (scores, promotions): one per value
+#   - other numeric columns: one per band, BANDS quantile bands of the column
+# A selection is resolved with bitwise ops only: values of the same column are OR-ed,
+# columns are AND-ed, and the result is unpacked to row positions once.
+# Option values are "column:number" keys into the index.
+
+MAX_DISTINCT = 12
+BANDS = 5
+
+
+def _label(column):
+    return column.replace("_", " ")
+
+
+class BitmapIndex:
+
+    def __init__(self, data, columns):
+        self.rows = len(data)
+        self.bitmaps = {}  # key -> packed bits
+        self.labels = {}  # key -> option label
+        self.column_of = {}  # key -> column
+        for column in columns:
+            if column in data:
+                self._add(column, data[column])
+
+    def _add(self, column, series):
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            present = values[~np.isnan(values)]
+            distinct = np.unique(present)
+            if len(distinct) <= MAX_DISTINCT:
+                codes = np.searchsorted(distinct, values)
+                names = [f"{v:,.0f}" if float(v).is_integer() else f"{v:,.2f}" for v in distinct]
+            else:
+                edges = np.unique(np.quantile(present, np.linspace(0, 1, BANDS + 1)))
+                codes = np.searchsorted(edges[1:-1], values, side="right")
+                names = [f"{lo:,.0f} – {hi:,.0f}" for lo, hi in zip(edges[:-1], edges[1:])]
+            codes = np.where(np.isnan(values), -1, codes)
+        else:
+            codes, uniques = pd.factorize(series, sort=True)
+            names = [str(u) for u in uniques]
+
+        for i, name in enumerate(names):
+            key = f"{column}:{i}"
+            self.bitmaps[key] = np.packbits(codes == i)
+            self.labels[key] = f"{_label(column)}: {name}"
+            self.column_of[key] = column
+
+    def options(self, columns):
+        # Dropdown options for the filter values of `columns`
+        return [{"label": self.labels[key], "value": key}
+                for key in self.bitmaps if self.column_of[key] in columns]
+
+    def select(self, keys):
+        # Packed bitmap of the employees matching every column's selected values (None: no filter)
+        by_column = {}
+        for key in keys:
+            if key in self.bitmaps:
+                column = self.column_of[key]
+                bits = self.bitmaps[key]
+                by_column[column] = bits if column not in by_column else by_column[column] | bits
+        if not by_column:
+            return None
+        result = None
+        for bits in by_column.values():
+            result = bits if result is None else result & bits
+        return result
+
+    def positions(self, keys):
+        # Row positions of the selection, or None when nothing is selected
+        bits = self.select(keys)
+        if bits is None:
+            return None
+        return np.flatnonzero(np.unpackbits(bits, count=self.rows))
+
+    def nbytes(self):
+        return sum(bits.nbytes for bits in self.bitmaps.values())
@@ -0,0 +1,114 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from employee_data import cache_dir, source_stamp
+
+# Department x metric aggregates for the dashboards.
+#
+# Every numeric column gets count, sum, mean and the quantiles in QUANTILES (min,
+# quartiles, median, max) per Department, plus the same over all employees. The rows
+# are grouped once: department codes are factorized a single time, counts and sums are
+# bincounts over them, and each column is ordered by (department, value) with two
+# stable argsorts (radix sorts for the int8/int16 columns of the typed loader), so the
+# quantiles (linear interpolation, as pandas does) are read at computed positions.
+# Missing values are left out of every statistic.
+# The cube is a few hundred numbers, saved as JSON in the data's cache directory with
+# the CSV's stamp; figures and KPI cards read from it instead of scanning the table.
+
+QUANTILES = {"min": 0.0, "q25": 0.25, "median": 0.5, "q75": 0.75, "max": 1.0}
+STATS = ["count", "sum", "mean"] + list(QUANTILES)
+CUBE_FILE = "department_cube.json"
+
+
+def _group_stats(values, codes, n_groups):
+    # Stats of `values` per group code (0..n_groups-1); NaN is dropped
+    order = np.argsort(values, kind="stable")  # NaN sorts last
+    order = order[np.argsort(codes[order], kind="stable")]
+    values = values.astype(np.float64)
+    valid = ~np.isnan(values)
+    sorted_values = values[order]
+
+    size = np.bincount(codes, minlength=n_groups)
+    count = np.bincount(codes[valid], minlength=n_groups)
+    start = np.concatenate([[0], np.cumsum(size)[:-1]])
+    total = np.bincount(codes[valid], weights=values[valid], minlength=n_groups)
+
+    stats = {"count": count, "sum": total}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        stats["mean"] = total / count
+    for name, q in QUANTILES.items():
+        pos = q * np.maximum(count - 1, 0)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.ceil(pos).astype(np.int64)
+        at_lo = sorted_values[np.minimum(start + lo, len(sorted_values) - 1)] if len(sorted_values) else np.zeros(n_groups)
+        at_hi = sorted_values[np.minimum(start + hi, len(sorted_values) - 1)] if len(sorted_values) else np.zeros(n_groups)
+        stats[name] = np.where(count > 0, at_lo + (at_hi - at_lo) * (pos - lo), np.nan)
+    return stats
+
+
+class DepartmentCube:
+
+    def __init__(self, departments, stats, overall):
+        self.departments = list(departments)
+        self.stats = stats  # column -> stat -> list of values, one per department
+        self.overall = overall  # column -> stat -> value over all employees
+
+    @classmethod
+    def build(cls, data, by="Department"):
+        codes, departments = pd.factorize(data[by], sort=True)
+        keep = codes >= 0  # employees without a department only count towards the overall figures
+        codes = codes[keep].astype(np.int16 if len(departments) < 2**15 else np.int64)
+        everyone = np.zeros(len(data), dtype=np.int8)
+        stats, overall = {}, {}
+        for column in data.columns:
+            series = data[column]
+            if column == by or not pd.api.types.is_numeric_dtype(series):
+                continue
+            if pd.api.types.is_bool_dtype(series) or series.hasnans:
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                values = series.to_numpy()  # native width, so the sorts stay cheap
+            per_group = _group_stats(values[keep], codes, len(departments))
+            whole = _group_stats(values, everyone, 1)
+            if pd.api.types.is_integer_dtype(series):
+                per_group["sum"], whole["sum"] = per_group["sum"].round().astype(np.int64), whole["sum"].round().astype(np.int64)
+            stats[column] = {stat: per_group[stat].tolist() for stat in STATS}
+            overall[column] = {stat: whole[stat][0].item() for stat in STATS}
+        return cls(departments, stats, overall)
+
+    def frame(self, column, stat="sum"):
+        # Same shape as data.groupby("Department")[column].<stat>().reset_index()
+        return pd.DataFrame({"Department": self.departments, column: self.stats[column][stat]})
+
+    def value(self, column, stat="mean"):
+        return self.overall[column][stat]
+
+    def to_dict(self):
+        return {"departments": self.departments, "stats": self.stats, "overall": self.overall}
+
+
+def load_cube(data, path="Employee.csv"):
+    # Aggregates for `data` (loaded from `path`), reused from the cache while the CSV is unchanged
+    cube_path = os.path.join(cache_dir(path), CUBE_FILE)
+    stamp = source_stamp(path)
+    try:
+        with open(cube_path) as f:
+            saved = json.load(f)
+        if saved.get("stamp") == stamp:
+            return DepartmentCube(saved["departments"], saved["stats"], saved["overall"])
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+
+    cube = DepartmentCube.build(data)
+    try:
+        os.makedirs(os.path.dirname(cube_path), exist_ok=True)
+        tmp = cube_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"stamp": stamp, **cube.to_dict()}, f)
+        os.replace(tmp, cube_path)
+    except OSError:
+        pass  # read-only location: the cube is rebuilt on the next start
+    return cube
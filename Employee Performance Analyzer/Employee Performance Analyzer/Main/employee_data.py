@@ -0,0 +1,194 @@
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Typed loading of Employee.csv with a columnar binary cache.
+#
+# The schema below fixes every column's type up front: small integer widths, text
+# columns such as Department and Job_Title as categoricals and Hire_Date with an
+# explicit format, so the CSV is parsed once without type inference. The typed columns
+# are then written to "<csv>.cache/" (one .npy file per column, categoricals as codes
+# plus their labels in meta.json). Later starts memory-map those files instead of
+# parsing the CSV. meta.json records the CSV's size and mtime and is written last; a
+# cache whose stamp doesn't match the CSV is simply rebuilt.
+#
+#   python employee_data.py Employee.csv   # reports cold vs warm load times
+
+SCHEMA_VERSION = 1
+INTEGER_COLUMNS = {
+    "Employee_ID": "int32",
+    "Age": "int8",
+    "Years_At_Company": "int8",
+    "Performance_Score": "int8",
+    "Work_Hours_Per_Week": "int16",
+    "Projects_Handled": "int16",
+    "Overtime_Hours": "int16",
+    "Sick_Days": "int16",
+    "Remote_Work_Frequency": "int16",
+    "Team_Size": "int16",
+    "Training_Hours": "int16",
+    "Promotions": "int8",
+}
+FLOAT_COLUMNS = {
+    "Monthly_Salary": "float64",
+    "Employee_Satisfaction_Score": "float32",
+}
+CATEGORY_COLUMNS = ["Department", "Gender", "Job_Title", "Education_Level"]
+DATE_COLUMNS = {"Hire_Date": "%Y-%m-%d %H:%M:%S.%f"}
+
+LOAD_STATS = {}  # how the last load_employees() call went: source, seconds, rows
+
+
+def cache_dir(path):
+    return path + ".cache"
+
+
+def source_stamp(path):
+    info = os.stat(path)
+    return {"size": info.st_size, "mtime_ns": info.st_mtime_ns, "schema": SCHEMA_VERSION}
+
+
+def _cast(values, dtype):
+    # The declared width when every value is a whole number that fits it,
+    # otherwise the smallest type that holds the column
+    values = pd.to_numeric(values)
+    if pd.api.types.is_integer_dtype(values):
+        info = np.iinfo(dtype)
+        if not len(values) or (values.min() >= info.min and values.max() <= info.max):
+            return values.astype(dtype)
+        return pd.to_numeric(values, downcast="integer")
+    return pd.to_numeric(values, downcast="float")
+
+
+def _to_date(values, fmt):
+    dates = pd.to_datetime(values, format=fmt, errors="coerce")
+    if dates.isna().sum() > values.isna().sum():
+        dates = pd.to_datetime(values, format="mixed", errors="coerce")
+    return dates
+
+
+def read_employees(path):
+    # Parse the CSV according to the schema (no cache involved)
+    dtype = {column: "category" for column in CATEGORY_COLUMNS}
+    dtype.update({column: "float64" for column in FLOAT_COLUMNS})
+    data = pd.read_csv(path, dtype=dtype)
+    for column, width in INTEGER_COLUMNS.items():
+        if column in data:
+            data[column] = _cast(data[column], width)
+    for column, width in FLOAT_COLUMNS.items():
+        if column in data:
+            data[column] = data[column].astype(width)
+    for column, fmt in DATE_COLUMNS.items():
+        if column in data:
+            data[column] = _to_date(data[column], fmt)
+    # Columns outside the schema: text becomes categorical too, numbers stay as read
+    for column in data.columns:
+        if not (pd.api.types.is_numeric_dtype(data[column])
+                or pd.api.types.is_datetime64_any_dtype(data[column])
+                or isinstance(data[column].dtype, pd.CategoricalDtype)):
+            data[column] = data[column].astype("category")
+    return data
+
+
+def write_cache(data, path):
+    directory = cache_dir(path)
+    meta_path = os.path.join(directory, "meta.json")
+    os.makedirs(directory, exist_ok=True)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)  # invalid until the new meta is in place
+
+    columns = []
+    for i, column in enumerate(data.columns):
+        series = data[column]
+        entry = {"name": column, "file": f"{i}.npy"}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            entry["kind"] = "category"
+            entry["categories"] = [str(c) for c in series.cat.categories]
+            values = series.cat.codes.to_numpy()
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            entry["kind"] = "datetime"
+            values = series.to_numpy(dtype="datetime64[ns]")
+        else:
+            entry["kind"] = "plain"
+            values = series.to_numpy()
+        np.save(os.path.join(directory, entry["file"]), values, allow_pickle=False)
+        columns.append(entry)
+
+    tmp = meta_path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({**source_stamp(path), "rows": len(data), "columns": columns}, f)
+    os.replace(tmp, meta_path)
+
+
+def read_cache(path):
+    # The cached frame, or None when there is no cache for this version of the CSV
+    directory = cache_dir(path)
+    try:
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    stamp = source_stamp(path)
+    if any(meta.get(key) != value for key, value in stamp.items()):
+        return None
+
+    columns = {}
+    for entry in meta["columns"]:
+        values = np.load(os.path.join(directory, entry["file"]), mmap_mode="r", allow_pickle=False)
+        if entry["kind"] == "category":
+            values = pd.Categorical.from_codes(values, categories=entry["categories"])
+        columns[entry["name"]] = pd.Series(values, name=entry["name"], copy=False)
+    return pd.DataFrame(columns, copy=False)
+
+
+def load_employees(path="Employee.csv", use_cache=True):
+    start = time.perf_counter()
+    data = read_cache(path) if use_cache else None
+    source = "cache"
+    if data is None:
+        data = read_employees(path)
+        source = "csv"
+        if use_cache:
+            try:
+                write_cache(data, path)
+            except OSError as e:
+                print(f"Could not write the employee cache: {e}", file=sys.stderr)
+    LOAD_STATS.update(source=source, seconds=time.perf_counter() - start, rows=len(data))
+    return data
+
+
+def untyped_load(path):
+    # What the dashboards did before: text parse, then pd.to_numeric / inferred to_datetime per column
+    data = pd.read_csv(path)
+    for column in INTEGER_COLUMNS.keys() | FLOAT_COLUMNS.keys():
+        data[column] = pd.to_numeric(data[column])
+    data["Hire_Date"] = pd.to_datetime(data["Hire_Date"])
+    return data
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "Employee.csv"
+    shutil.rmtree(cache_dir(path), ignore_errors=True)
+
+    start = time.perf_counter()
+    untyped_load(path)
+    untyped = time.perf_counter() - start
+
+    load_employees(path)
+    cold = LOAD_STATS["seconds"]
+    load_employees(path)
+    warm = LOAD_STATS["seconds"]
+
+    print(f"{LOAD_STATS['rows']:,} employees")
+    print(f"untyped load_data()  {untyped:8.3f}s")
+    print(f"cold (parse + cache) {cold:8.3f}s")
+    print(f"warm (memory-mapped) {warm:8.3f}s  ({cold / warm:,.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,90 +2,96 @@ import dash
 import dash_bootstrap_components as dbc
 from dash import dcc,Input,Output,html
 import plotly.express as px
-import pandas as pd
+from functools import lru_cache
+
+from age_histogram import FIGURE_CACHE, AgeHistogram
+from bitmap_index import BitmapIndex
+from department_cube import DepartmentCube, load_cube
+from employee_data import LOAD_STATS, load_employees
 
 # Loading Data
 
 def load_data():
 
-    data = pd.read_csv("Employee.csv")
-    
-    # Converting CSV Numeric to pd.numeric
-    data["Employee_ID"] = pd.to_numeric(data["Employee_ID"])
-    data["Age"] = pd.to_numeric(data["Age"])
-    data["Years_At_Company"] = pd.to_numeric(data["Years_At_Company"])
-    data["Performance_Score"] = pd.to_numeric(data["Performance_Score"])
-    data["Monthly_Salary"] = pd.to_numeric(data["Monthly_Salary"])
-    data["Work_Hours_Per_Week"] = pd.to_numeric(data["Work_Hours_Per_Week"])
-    data["Projects_Handled"] = pd.to_numeric(data["Projects_Handled"])
-    data["Overtime_Hours"] = pd.to_numeric(data["Overtime_Hours"])
-    data["Sick_Days"] = pd.to_numeric(data["Sick_Days"])
-    data["Remote_Work_Frequency"] = pd.to_numeric(data["Remote_Work_Frequency"])
-    data["Team_Size"] = pd.to_numeric(data["Team_Size"])
-    data["Training_Hours"] = pd.to_numeric(data["Training_Hours"])
-    data["Promotions"] = pd.to_numeric(data["Promotions"])
-    data["Employee_Satisfaction_Score"] = pd.to_numeric(data["Employee_Satisfaction_Score"])
-    
-    # Converting CSV Date to pd.datetime
-    
-    data["Hire_Date"] = pd.to_datetime(data["Hire_Date"])
+    # Typed columns (small ints, categoricals, explicit date format); after the first
+    # start they are memory-mapped from Employee.csv.cache instead of parsed (see employee_data.py)
+    data = load_employees("Employee.csv")
+    print(f"Loaded {LOAD_STATS['rows']:,} employees from {LOAD_STATS['source']} in {LOAD_STATS['seconds']:.3f}s")
     
     return data
 data = load_data()
 
-# Creating the dash app
-app = dash.Dash(__name__,external_stylesheets=[dbc.themes.BOOTSTRAP])
+# Per-department sums, counts, means and quantiles of every numeric column, computed in
+# one grouped pass and cached next to Employee.csv; all figures and stats below read from it
+cube = load_cube(data)
 
-# Figures 
+# Employees per age, counted once; the age slider only slices it
+age_histogram = AgeHistogram(data["Age"])
 
-team_size_by_department = data.groupby('Department')['Team_Size'].sum().reset_index()
-fig = px.bar(
-    team_size_by_department,
-    y='Team_Size',
-    title="Total Team Size per Department",
-    color='Department',
-    color_discrete_sequence=px.colors.qualitative.Set2
-)
+# Cross-filters: the columns each Dropdown offers. Every value has a precomputed bitmap,
+# so a combination of filters is a few AND / OR operations (see bitmap_index.py)
+FILTERS = {
+    "size-filter": ["Department", "Team_Size"],
+    "performance-filter": ["Job_Title", "Performance_Score", "Projects_Handled"],
+    "promo-filter": ["Gender", "Education_Level", "Promotions"],
+    "ave-filter": ["Monthly_Salary", "Years_At_Company"],
+}
+FIGURE_COLUMNS = ["Department", "Team_Size", "Projects_Handled", "Monthly_Salary", "Promotions"]
+filter_index = BitmapIndex(data, [column for columns in FILTERS.values() for column in columns])
 
-project_handled = data.groupby('Department')['Projects_Handled'].sum().reset_index()
-fig1 = px.bar(
-    project_handled,
-    y='Projects_Handled',
-    title="Projects Handled by each Department",
-    color='Department',
-    color_discrete_sequence=px.colors.qualitative.Set2
-)
+# Creating the dash app
+app = dash.Dash(__name__,external_stylesheets=[dbc.themes.BOOTSTRAP])
 
-average_salary = data.groupby('Department')['Monthly_Salary'].median().reset_index()
-fig2 = px.bar(
-    average_salary,
-    y='Monthly_Salary',
-    title="Projects Handled by each Department",
-    color='Department',
-    color_discrete_sequence=px.colors.qualitative.Set2
-)
+# Figures 
 
-promotions = data.groupby('Department')['Promotions'].sum().reset_index()
-fig3 = px.bar(
-    promotions,
-    y='Promotions',
-    title="Promotions at each Department",
-    color='Department',
-    color_discrete_sequence=px.colors.qualitative.Set2
-)
+def department_figures(cube):
+
+    team_size_by_department = cube.frame('Team_Size', 'sum')
+    fig = px.bar(
+        team_size_by_department,
+        y='Team_Size',
+        title="Total Team Size per Department",
+        color='Department',
+        color_discrete_sequence=px.colors.qualitative.Set2
+    )
+
+    project_handled = cube.frame('Projects_Handled', 'sum')
+    fig1 = px.bar(
+        project_handled,
+        y='Projects_Handled',
+        title="Projects Handled by each Department",
+        color='Department',
+        color_discrete_sequence=px.colors.qualitative.Set2
+    )
+
+    average_salary = cube.frame('Monthly_Salary', 'median')
+    fig2 = px.bar(
+        average_salary,
+        y='Monthly_Salary',
+        title="Projects Handled by each Department",
+        color='Department',
+        color_discrete_sequence=px.colors.qualitative.Set2
+    )
+
+    promotions = cube.frame('Promotions', 'sum')
+    fig3 = px.bar(
+        promotions,
+        y='Promotions',
+        title="Promotions at each Department",
+        color='Department',
+        color_discrete_sequence=px.colors.qualitative.Set2
+    )
+
+    return fig, fig1, fig2, fig3
+
+fig, fig1, fig2, fig3 = department_figures(cube)
 
 # App layout and design
 
-def count(x):
-    counter = 0
-    for y in x:
-        counter += 1
-    return counter
-
-data_day = int((data["Work_Hours_Per_Week"]/7).mean())
-data_age = data["Age"].mean()
-data_no = count(data["Department"].unique())
-total_employees = count(data["Employee_ID"])
+data_day = int(cube.value("Work_Hours_Per_Week", "mean")/7)
+data_age = cube.value("Age", "mean")
+data_no = len(cube.departments)
+total_employees = cube.value("Employee_ID", "count")
 
 app.layout = dbc.Container([
     dbc.Row([
@@ -119,7 +125,10 @@ app.layout = dbc.Container([
                 dbc.CardBody([
                     html.H4("Employee Demographics : Size of each Department",className="card-title"),
                     dcc.Dropdown(
-                        id="size-filter"
+                        id="size-filter",
+                        options=filter_index.options(FILTERS["size-filter"]),
+                        multi=True,
+                        placeholder="Filter by department or team size"
                     ),
                     dcc.Graph(id='dep-distribution', figure=fig)
                 ])
@@ -130,7 +139,10 @@ app.layout = dbc.Container([
                 dbc.CardBody([
                     html.H4("Employee Demographics : Projects Handled by each Department",className="card-title"),
                     dcc.Dropdown(
-                        id="performance-filter"
+                        id="performance-filter",
+                        options=filter_index.options(FILTERS["performance-filter"]),
+                        multi=True,
+                        placeholder="Filter by job title, performance or projects"
                     ),
                     dcc.Graph(id="performance-distribution",figure=fig1)
                 ])
@@ -146,10 +158,10 @@ app.layout = dbc.Container([
                     html.H4("No of Employee at different Age",className="card-title"),
                     dcc.Slider(
                         id="age-slider",
-                        min=data['Age'].min(),
-                        max=data['Age'].max(),
-                        value=data['Age'].median(),
-                        marks={int(value):f"{int(value)}" for value in data["Age"].quantile([0,0.25,0.5,0.75,1]).values},
+                        min=cube.value('Age', 'min'),
+                        max=cube.value('Age', 'max'),
+                        value=cube.value('Age', 'median'),
+                        marks={int(value):f"{int(value)}" for value in (cube.value("Age", q) for q in ["min","q25","median","q75","max"])},
                         step=100
                     
                     
@@ -166,7 +178,10 @@ app.layout = dbc.Container([
                 dbc.CardBody([
                     html.H4("No of Promotion in each department",className="card-title"),
                     dcc.Dropdown(
-                        id="promo-filter"
+                        id="promo-filter",
+                        options=filter_index.options(FILTERS["promo-filter"]),
+                        multi=True,
+                        placeholder="Filter by gender, education or promotions"
                     ),
                     dcc.Graph(id="department",figure=fig3)
                 ])
@@ -180,7 +195,10 @@ app.layout = dbc.Container([
                 dbc.CardBody([
                     html.H4("Average Salary at each department",className="card-title"),
                     dcc.Dropdown(
-                        id="ave-filter"
+                        id="ave-filter",
+                        options=filter_index.options(FILTERS["ave-filter"]),
+                        multi=True,
+                        placeholder="Filter by salary or years at company"
                     ),
                     dcc.Graph(
                         id="salary",figure=fig2
@@ -194,22 +212,54 @@ app.layout = dbc.Container([
 
 # Create Our Callbacks
 
+def selection(*values):
+    # All selected filter values as one hashable key
+    return tuple(sorted(key for value in values for key in (value or [])))
+
+@app.callback(
+    Output("dep-distribution", "figure"),
+    Output("performance-distribution", "figure"),
+    Output("department", "figure"),
+    Output("salary", "figure"),
+    *[Input(name, "value") for name in FILTERS]
+)
+def update_department_graphs(*values):
+    return filtered_figures(selection(*values))
+
+@lru_cache(maxsize=FIGURE_CACHE)
+def filtered_figures(keys):
+    # Department figures over the selected employees only; no filter means the cached cube
+    rows = filter_index.positions(keys)
+    if rows is None:
+        return fig, fig1, fig2, fig3
+    return department_figures(DepartmentCube.build(data[FIGURE_COLUMNS].iloc[rows]))
+
+@lru_cache(maxsize=FIGURE_CACHE)
+def histogram_for(keys):
+    rows = filter_index.positions(keys)
+    return age_histogram if rows is None else AgeHistogram(data["Age"].to_numpy()[rows])
+
 @app.callback(
     Output("members-each-dep", "figure"),
-    Input("age-slider", "value")
+    Input("age-slider", "value"),
+    *[Input(name, "value") for name in FILTERS]
 )
-def update_graph(selected_age):
-    # Filter data for employees with Age <= selected value
-    filtered_data = data[data["Age"] <= selected_age]
+def update_graph(selected_age, *values):
+    return age_figure(selected_age, selection(*values))
 
-    # Group by Age and count the number of employees
-    team_size_by_age = filtered_data.groupby("Age").size().reset_index(name="Team Size")
+# Figures are memoized per slider value and filter selection (bounded LRU), so revisiting costs nothing
+@lru_cache(maxsize=FIGURE_CACHE)
+def age_figure(selected_age, keys=()):
+    # Number of employees at each age up to the selected value, sliced from the histogram
+    histogram = histogram_for(keys)
+    team_size_by_age = histogram.up_to(selected_age)
+    total = histogram.total_up_to(selected_age)
 
     # Create line chart
     fig = px.line(team_size_by_age, x="Age", y="Team Size",
                   markers=True,
                   labels={"Age": "Age", "Team Size": "Number of Employees"},
-                  title=f"Team Size Distribution for Age ≤ {selected_age}")
+                  title=f"Team Size Distribution for Age ≤ {selected_age} ({total:,} employees)")
     
     fig.update_traces(line=dict(color="red"))
     fig.update_layout(hovermode="x unified")
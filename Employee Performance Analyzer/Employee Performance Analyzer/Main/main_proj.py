@@ -3,35 +3,30 @@ import dash_bootstrap_components as dbc
 from dash import dcc, Input, Output, html
 import plotly.express as px
 import plotly.graph_objects as go
-import pandas as pd
+from functools import lru_cache
+
+from age_histogram import FIGURE_CACHE, AgeHistogram
+from department_cube import load_cube
+from employee_data import LOAD_STATS, load_employees
 
 # Load Data
 def load_data():
-    data = pd.read_csv("Employee.csv")
-    numeric_cols = [
-        "Employee_ID", "Age", "Years_At_Company", "Performance_Score", "Monthly_Salary",
-        "Work_Hours_Per_Week", "Projects_Handled", "Overtime_Hours", "Sick_Days",
-        "Remote_Work_Frequency", "Team_Size", "Training_Hours", "Promotions",
-        "Employee_Satisfaction_Score"
-    ]
-    for col in numeric_cols:
-        data[col] = pd.to_numeric(data[col])
-    data["Hire_Date"] = pd.to_datetime(data["Hire_Date"])
+    # Typed schema, memory-mapped from Employee.csv.cache after the first start (see employee_data.py)
+    data = load_employees("Employee.csv")
+    print(f"Loaded {LOAD_STATS['rows']:,} employees from {LOAD_STATS['source']} in {LOAD_STATS['seconds']:.3f}s")
     return data
 
 # Initialize Data and App
 data = load_data()
+cube = load_cube(data)  # per-department aggregates, one grouped pass, cached next to Employee.csv
+age_histogram = AgeHistogram(data["Age"])  # employees per age, sliced by the age slider
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.CYBORG])  # CYBORG theme for modern dark look
 
-# Helper Functions
-def count_unique(x):
-    return len(set(x))
-
-# Precomputed Stats
-data_day = int((data["Work_Hours_Per_Week"] / 7).mean())
-data_age = round(data["Age"].mean(), 1)
-data_no = count_unique(data["Department"])
-total_employees = count_unique(data["Employee_ID"])
+# Precomputed Stats (all from the aggregate cube)
+data_day = int(cube.value("Work_Hours_Per_Week", "mean") / 7)
+data_age = round(cube.value("Age", "mean"), 1)
+data_no = len(cube.departments)
+total_employees = cube.value("Employee_ID", "count")
 
 # Layout
 app.layout = dbc.Container([
@@ -120,7 +115,7 @@ app.layout = dbc.Container([
                 dbc.CardBody([
                     html.H4("Department-wise Team Size", className="card-title text-center mb-4 fs-4 fw-semibold"),
                     dcc.Graph(figure=px.bar(
-                        data.groupby('Department')['Team_Size'].sum().reset_index(),
+                        cube.frame('Team_Size', 'sum'),
                         y='Team_Size', color='Department',
                         title="Total Team Size per Department",
                         color_discrete_sequence=px.colors.qualitative.Set2,
@@ -134,7 +129,7 @@ app.layout = dbc.Container([
                 dbc.CardBody([
                     html.H4("Projects Handled by Department", className="card-title text-center mb-4 fs-4 fw-semibold"),
                     dcc.Graph(figure=px.area(
-                        data.groupby('Department')['Projects_Handled'].sum().reset_index(),
+                        cube.frame('Projects_Handled', 'sum'),
                         x='Department', y='Projects_Handled',
                         title="Projects Handled by each Department",
                         template="plotly_dark",
@@ -152,10 +147,10 @@ app.layout = dbc.Container([
                     html.H4("Employees by Age (Adjust Slider)", className="card-title text-center mb-4 fs-4 fw-semibold"),
                     dcc.Slider(
                         id="age-slider",
-                        min=data['Age'].min(),
-                        max=data['Age'].max(),
-                        value=data['Age'].median(),
-                        marks={int(val): f"{int(val)}" for val in data["Age"].quantile([0, 0.25, 0.5, 0.75, 1])},
+                        min=cube.value('Age', 'min'),
+                        max=cube.value('Age', 'max'),
+                        value=cube.value('Age', 'median'),
+                        marks={int(val): f"{int(val)}" for val in (cube.value("Age", q) for q in ["min", "q25", "median", "q75", "max"])},
                         step=1
                     ),
                     dcc.Graph(id="members-each-dep")
@@ -170,7 +165,7 @@ app.layout = dbc.Container([
                 dbc.CardBody([
                     html.H4("Promotions by Department", className="card-title text-center mb-4 fs-4 fw-semibold"),
                     dcc.Graph(figure=px.scatter(
-                        data.groupby('Department')['Promotions'].sum().reset_index(),
+                        cube.frame('Promotions', 'sum'),
                         x='Department', y='Promotions',
                         title="Promotions per Department",
                         template="plotly_dark",
@@ -187,7 +182,7 @@ app.layout = dbc.Container([
                 dbc.CardBody([
                     html.H4("Median Salary by Department", className="card-title text-center mb-4 fs-4 fw-semibold"),
                     dcc.Graph(figure=px.treemap(
-                        data.groupby('Department')['Monthly_Salary'].median().reset_index(),
+                        cube.frame('Monthly_Salary', 'median'),
                         path=['Department'], values='Monthly_Salary',
                         title="Average Salary by Department",
                         template="plotly_dark",
@@ -206,10 +201,15 @@ app.layout = dbc.Container([
     Input("age-slider", "value")
 )
 def update_graph(selected_age):
-    filtered = data[data["Age"] <= selected_age]
-    team_size_by_age = filtered.groupby("Age").size().reset_index(name="Team Size")
+    return age_figure(selected_age)
+
+# Memoized per slider value (bounded LRU); each figure is a slice of the precomputed histogram
+@lru_cache(maxsize=FIGURE_CACHE)
+def age_figure(selected_age):
+    team_size_by_age = age_histogram.up_to(selected_age)
+    total = age_histogram.total_up_to(selected_age)
     fig = px.line(team_size_by_age, x="Age", y="Team Size", markers=True,
-                  title=f"Team Size Distribution for Age ≤ {selected_age}",
+                  title=f"Team Size Distribution for Age ≤ {selected_age} ({total:,} employees)",
                   labels={"Age": "Age", "Team Size": "Number of Employees"},
                   template="plotly_dark")
     fig.update_traces(line=dict(color="red"))